@@ -2,17 +2,37 @@
 """Chopsticks Charm - Distributed Ceph stress testing with Locust."""
 
 import datetime
+import functools
 import logging
 import os
+import re
+import shlex
 import shutil
+import string
 import subprocess
 import tarfile
 import uuid
+from collections.abc import Callable, Sequence
 from pathlib import Path
 
 import ops
 import yaml
 
+try:
+    # Prefer the libyaml C bindings when PyYAML was built with them
+    from yaml import CSafeDumper as SafeDumper
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeDumper, SafeLoader
+
+try:
+    # Optional: query systemd over D-Bus instead of forking systemctl
+    from pystemd.dbuslib import DBus
+    from pystemd.systemd1 import Unit
+except ImportError:
+    DBus = None
+    Unit = None
+
 logger = logging.getLogger(__name__)
 
 REPO_DIR = Path("/opt/chopsticks/src")
@@ -26,21 +46,132 @@ SYSTEMD_DIR = Path("/etc/systemd/system")
 LEADER_SERVICE = "chopsticks-leader"
 LEADER_WEBUI_SERVICE = "chopsticks-leader-webui"
 WORKER_SERVICE = "chopsticks-worker"
+ALL_SERVICES = (LEADER_SERVICE, LEADER_WEBUI_SERVICE, WORKER_SERVICE)
+
+REQUIRED_S3_KEYS = frozenset({"s3-endpoint", "s3-access-key", "s3-secret-key"})
+
+# Branch or tag names interpolated into shell commands
+BRANCH_PATTERN = re.compile(r"^[A-Za-z0-9._][A-Za-z0-9._/-]*$")
+
+
+def _unit_template(text: str) -> string.Template:
+    """Fold the install paths into a unit template, leaving per-call fields."""
+    static = string.Template(text).safe_substitute(
+        REPO_DIR=REPO_DIR,
+        VENV_DIR=VENV_DIR,
+        S3_CONFIG_PATH=S3_CONFIG_PATH,
+    )
+    return string.Template(static)
+
+
+# Systemd unit templates, rendered once at import except for per-test fields
+LEADER_UNIT_TEMPLATE = _unit_template("""[Unit]
+Description=$description
+After=network.target
+
+[Service]
+Type=simple
+User=root
+WorkingDirectory=$REPO_DIR
+Environment=PATH=$VENV_DIR/bin:/usr/local/bin:/usr/bin:/bin
+Environment=CHOPSTICKS_SCENARIO_FILE=$scenario_path$headless_env
+ExecStart=$VENV_DIR/bin/chopsticks run \\
+    --workload-config=$S3_CONFIG_PATH \\
+    -f $scenario_path \\
+    --leader$headless_args
+Restart=no
+StandardOutput=journal
+StandardError=journal
+
+[Install]
+WantedBy=multi-user.target
+""")
+
+LEADER_HEADLESS_ENV_TEMPLATE = string.Template("""
+Environment=CHOPSTICKS_RUN_DIR=$metrics_dir
+Environment=CHOPSTICKS_USERS=$users
+Environment=CHOPSTICKS_SPAWN_RATE=$spawn_rate
+Environment=CHOPSTICKS_DURATION=$duration""")
+
+LEADER_HEADLESS_ARGS_TEMPLATE = string.Template(""" \\
+    --headless \\
+    --users=$users \\
+    --spawn-rate=$spawn_rate \\
+    --duration=$duration""")
+
+WORKER_UNIT_CONTENT = _unit_template("""[Unit]
+Description=Chopsticks Locust Worker
+After=network.target
+
+[Service]
+Type=simple
+User=root
+WorkingDirectory=$REPO_DIR
+Environment=PATH=$VENV_DIR/bin:/usr/local/bin:/usr/bin:/bin
+ExecStart=$VENV_DIR/bin/chopsticks run \\
+    --workload-config=$S3_CONFIG_PATH \\
+    --worker
+Restart=on-failure
+RestartSec=5
+StandardOutput=journal
+StandardError=journal
+
+[Install]
+WantedBy=multi-user.target
+""").template
+
+
+def _write_if_changed(path: Path, content: str, mode: int = 0o644) -> bool:
+    """Atomically write content to path unless the file already holds it.
+
+    The new content goes to a temporary sibling created with the final
+    permissions, then replaces the file, so readers never see a partial
+    write. Returns True if the file was written.
+    """
+    data = content.encode()
+    try:
+        if path.read_bytes() == data:
+            return False
+    except FileNotFoundError:
+        pass
+
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode)
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+    os.chmod(tmp_path, mode)
+    os.replace(tmp_path, path)
+    return True
+
+
+def _hook_scoped(handler: Callable) -> Callable:
+    """Reset the charm's per-hook caches before running an event handler."""
+
+    @functools.wraps(handler)
+    def wrapper(self: "ChopsticksCharm", event: ops.EventBase) -> None:
+        self._reset_hook_caches()
+        handler(self, event)
+
+    return wrapper
 
 
 class ChopsticksCharm(ops.CharmBase):
     """Charm for distributed Ceph stress testing using Locust."""
 
+    _stored = ops.StoredState()
+
     def __init__(self, framework: ops.Framework):
         super().__init__(framework)
+        # Leader address last published (leader) or acted upon (worker)
+        self._stored.set_default(last_published_leader="", last_seen_leader="")
 
         self.framework.observe(self.on.install, self._on_install)
         self.framework.observe(self.on.config_changed, self._on_config_changed)
-        self.framework.observe(self.on.start, self._on_start)
         self.framework.observe(self.on.stop, self._on_stop)
         self.framework.observe(self.on.remove, self._on_remove)
         self.framework.observe(self.on.update_status, self._on_update_status)
         self.framework.observe(self.on.leader_elected, self._on_leader_elected)
+        self.framework.observe(self.on.collect_unit_status, self._on_collect_unit_status)
 
         self.framework.observe(self.on.cluster_relation_joined, self._on_cluster_changed)
         self.framework.observe(self.on.cluster_relation_changed, self._on_cluster_changed)
@@ -51,36 +182,86 @@ class ChopsticksCharm(ops.CharmBase):
         self.framework.observe(self.on.test_status_action, self._on_test_status_action)
         self.framework.observe(self.on.fetch_metrics_action, self._on_fetch_metrics_action)
 
-    @property
+        self._app_databag: ops.RelationDataContent | None = None
+        # Failure status raised by a handler, reported at collect-status time
+        self._error_status: ops.StatusBase | None = None
+        self._config_valid: bool | None = None
+        # System bus connection: None until first use, False if unavailable
+        self._systemd_bus = None
+        # Set when a unit file was written; flushed by _flush_daemon_reload
+        self._pending_daemon_reload = False
+        # Render inputs of each unit file written during the current hook
+        self._rendered_units: dict[str, tuple] = {}
+        # Peer app databag values read (or written) during the current hook
+        self._peer_cache: dict[str, str | None] = {}
+
+    # Each hook runs in a fresh process, so the model lookups below are cached
+    # for the lifetime of the charm instance. Handlers decorated with
+    # _hook_scoped drop them on entry, which matters when one instance sees
+    # several events, as under the testing Harness.
+
+    def _reset_hook_caches(self) -> None:
+        """Forget model lookups cached by a previous event."""
+        self.__dict__.pop("_peer_relation", None)
+        self.__dict__.pop("_private_ip", None)
+        self._app_databag = None
+        self._peer_cache.clear()
+        self._config_valid = None
+        self._rendered_units.clear()
+
+    @functools.cached_property
     def _peer_relation(self) -> ops.Relation | None:
         return self.model.get_relation("cluster")
 
+    def _peer_app_databag(self) -> ops.RelationDataContent | None:
+        """Return the peer relation app databag, looked up once per hook."""
+        if self._app_databag is None:
+            rel = self._peer_relation
+            if rel:
+                self._app_databag = rel.data[self.app]
+        return self._app_databag
+
     def _get_peer_data(self, key: str, default: str = "") -> str:
-        """Get data from peer relation app databag."""
-        rel = self._peer_relation
-        if not rel:
-            logger.debug(
-                "_get_peer_data(%s): no peer relation, returning default=%s", key, default
-            )
-            return default
-        value = rel.data[self.app].get(key, default)
+        """Get data from peer relation app databag, cached for the hook."""
+        if key not in self._peer_cache:
+            databag = self._peer_app_databag()
+            if databag is None:
+                logger.debug(
+                    "_get_peer_data(%s): no peer relation, returning default=%s", key, default
+                )
+                return default
+            self._peer_cache[key] = databag.get(key)
+        value = self._peer_cache[key]
+        if value is None:
+            value = default
         logger.debug("_get_peer_data(%s) = %s", key, value)
         return value
 
     def _set_peer_data(self, key: str, value: str) -> None:
         """Set data in peer relation app databag (leader only)."""
+        self._set_peer_data_bulk({key: value})
+
+    def _set_peer_data_bulk(self, updates: dict[str, str]) -> bool:
+        """Set several keys in the peer app databag with one relation-set (leader only).
+
+        Returns whether the databag was written.
+        """
         if not self.unit.is_leader():
-            logger.debug("_set_peer_data(%s): skipping, not leader", key)
-            return
+            logger.debug("_set_peer_data_bulk(%s): skipping, not leader", list(updates))
+            return False
         rel = self._peer_relation
-        if rel:
-            logger.debug("_set_peer_data(%s, %s)", key, value)
-            rel.data[self.app][key] = value
-        else:
-            logger.debug("_set_peer_data(%s): no peer relation available", key)
+        if not rel:
+            logger.debug("_set_peer_data_bulk(%s): no peer relation available", list(updates))
+            return False
+        logger.debug("_set_peer_data_bulk(%s)", updates)
+        rel.data[self.app].update(updates)
+        self._app_databag = None
+        self._peer_cache.update(updates)
+        return True
 
     # Lifecycle event handlers
 
+    @_hook_scoped
     def _on_install(self, event: ops.InstallEvent) -> None:
         """Install dependencies and clone repository."""
         logger.debug("_on_install: starting installation")
@@ -99,12 +280,13 @@ class ChopsticksCharm(ops.CharmBase):
             self._create_directories()
             logger.debug("_on_install: installing systemd units")
             self._install_systemd_units()
+            self._flush_daemon_reload()
             logger.debug("_on_install: completed successfully")
-            self.unit.status = ops.ActiveStatus("Installed")
-        except subprocess.CalledProcessError as e:
+        except (subprocess.CalledProcessError, ValueError) as e:
             logger.error("Installation failed: %s", e)
-            self.unit.status = ops.BlockedStatus(f"Install failed: {e}")
+            self._error_status = ops.BlockedStatus(f"Install failed: {e}")
 
+    @_hook_scoped
     def _on_config_changed(self, event: ops.ConfigChangedEvent) -> None:
         """Handle configuration changes."""
         logger.debug("_on_config_changed: starting, is_leader=%s", self.unit.is_leader())
@@ -123,28 +305,20 @@ class ChopsticksCharm(ops.CharmBase):
                 self._publish_leader_address()
 
             if not self._is_config_valid():
-                logger.debug("_on_config_changed: config not valid, setting blocked status")
-                self.unit.status = ops.BlockedStatus("Missing S3 configuration")
+                logger.debug("_on_config_changed: config not valid, not starting worker")
                 return
 
             if not self.unit.is_leader() and self.config.get("autostart-workers"):
                 logger.debug("_on_config_changed: attempting to start worker (non-leader)")
                 self._maybe_start_worker()
-
-            logger.debug("_on_config_changed: setting ready status")
-            self._set_ready_status()
         except Exception as e:
             logger.exception("Config change failed")
-            self.unit.status = ops.BlockedStatus(f"Config error: {e}")
-
-    def _on_start(self, event: ops.StartEvent) -> None:
-        """Handle start event."""
-        logger.debug("_on_start: setting ready status")
-        self._set_ready_status()
+            self._error_status = ops.BlockedStatus(f"Config error: {e}")
 
+    @_hook_scoped
     def _on_update_status(self, event: ops.UpdateStatusEvent) -> None:
-        """Periodically refresh status (e.g., if services crash)."""
-        logger.debug("_on_update_status: refreshing status")
+        """Periodically check for crashed services; status is refreshed at collect-status."""
+        logger.debug("_on_update_status: checking services")
 
         if self.unit.is_leader():
             test_state = self._get_peer_data("test_state", "idle")
@@ -157,41 +331,37 @@ class ChopsticksCharm(ops.CharmBase):
                     )
                     self._set_peer_data("test_state", "failed")
 
-        self._set_ready_status()
-
+    @_hook_scoped
     def _on_stop(self, event: ops.StopEvent) -> None:
         """Handle stop event - cleanup services."""
         logger.debug("_on_stop: stopping all services")
         self._stop_all_services()
 
+    @_hook_scoped
     def _on_remove(self, event: ops.RemoveEvent) -> None:
         """Handle remove event - cleanup all artifacts."""
         logger.debug("_on_remove: starting cleanup")
-        self._stop_all_services()
-
-        if REPO_DIR.exists():
-            shutil.rmtree(REPO_DIR, ignore_errors=True)
-            logger.info("Removed repository: %s", REPO_DIR)
-
-        if VENV_DIR.exists():
-            shutil.rmtree(VENV_DIR, ignore_errors=True)
-            logger.info("Removed venv: %s", VENV_DIR)
-
-        if CONFIG_DIR.exists():
-            shutil.rmtree(CONFIG_DIR, ignore_errors=True)
-            logger.info("Removed config: %s", CONFIG_DIR)
+        subprocess.run(
+            ["systemctl", "disable", "--now", *(f"{s}.service" for s in ALL_SERVICES)],
+            capture_output=True,
+        )
 
-        if DATA_DIR.exists():
-            shutil.rmtree(DATA_DIR, ignore_errors=True)
-            logger.info("Removed data: %s", DATA_DIR)
+        # One rm call removes every artifact, including the unit files
+        unit_files = [SYSTEMD_DIR / f"{s}.service" for s in ALL_SERVICES]
+        paths = [REPO_DIR, VENV_DIR, CONFIG_DIR, DATA_DIR, *unit_files]
+        subprocess.run(["rm", "-rf", *(str(p) for p in paths)], check=False)
+        logger.info(
+            "Removed repository, venv, config and data: %s, %s, %s, %s",
+            REPO_DIR,
+            VENV_DIR,
+            CONFIG_DIR,
+            DATA_DIR,
+        )
 
-        for service in [LEADER_SERVICE, LEADER_WEBUI_SERVICE, WORKER_SERVICE]:
-            service_path = SYSTEMD_DIR / f"{service}.service"
-            if service_path.exists():
-                service_path.unlink()
         subprocess.run(["systemctl", "daemon-reload"], capture_output=True)
         logger.info("Removed systemd units")
 
+    @_hook_scoped
     def _on_leader_elected(self, event: ops.LeaderElectedEvent) -> None:
         """Handle leader election.
 
@@ -216,9 +386,7 @@ class ChopsticksCharm(ops.CharmBase):
         else:
             self._set_peer_data("test_state", "idle")
 
-        logger.debug("_on_leader_elected: setting ready status")
-        self._set_ready_status()
-
+    @_hook_scoped
     def _on_cluster_changed(self, event: ops.RelationEvent) -> None:
         """Handle peer relation changes.
 
@@ -232,18 +400,24 @@ class ChopsticksCharm(ops.CharmBase):
             self.unit.is_leader(),
         )
         if self.unit.is_leader():
+            if self._private_ip and self._private_ip == self._stored.last_published_leader:
+                logger.debug("_on_cluster_changed: leader address unchanged, nothing to publish")
+                return
             logger.debug("_on_cluster_changed: publishing leader address")
             self._publish_leader_address()
         else:
             new_leader = self._get_peer_data("leader_address", "")
-            current_leader = self._read_runtime_config().get("leader_host", "")
-            if self._is_service_running(WORKER_SERVICE) and new_leader != current_leader:
-                self._stop_service(WORKER_SERVICE)
-                logger.info(
-                    "_on_cluster_changed: stopped worker due to leader change (old: %s, new: %s)",
-                    current_leader or "unknown",
-                    new_leader or "unknown",
-                )
+            if new_leader != self._stored.last_seen_leader:
+                current_leader = self._read_runtime_config().get("leader_host", "")
+                if new_leader != current_leader and self._is_service_running(WORKER_SERVICE):
+                    self._stop_service(WORKER_SERVICE)
+                    logger.info(
+                        "_on_cluster_changed: stopped worker due to leader change "
+                        "(old: %s, new: %s)",
+                        current_leader or "unknown",
+                        new_leader or "unknown",
+                    )
+                self._stored.last_seen_leader = new_leader
             if new_leader:
                 scenario_file = (
                     self._get_peer_data("scenario_file")
@@ -260,8 +434,6 @@ class ChopsticksCharm(ops.CharmBase):
                 logger.debug("_on_cluster_changed: attempting to start worker (non-leader)")
                 self._maybe_start_worker()
 
-        self._set_ready_status()
-
     def _validate_preconditions(self, event: ops.ActionEvent) -> bool:
         """Validate preconditions for starting a test.
 
@@ -327,8 +499,7 @@ class ChopsticksCharm(ops.CharmBase):
                               users: int, spawn_rate: float, duration: str) -> None:
         """Start the appropriate leader service (headless or web UI)."""
         logger.debug("_start_leader_service: stopping existing leader services")
-        self._stop_service(LEADER_SERVICE)
-        self._stop_service(LEADER_WEBUI_SERVICE)
+        self._stop_services([LEADER_SERVICE, LEADER_WEBUI_SERVICE])
 
         if headless:
             logger.debug("_start_leader_service: rendering and starting headless leader")
@@ -348,9 +519,11 @@ class ChopsticksCharm(ops.CharmBase):
     def _update_test_state(self, test_run_id: str, scenario: str) -> None:
         """Update peer data and runtime config for active test."""
         logger.debug("_update_test_state: updating peer data for test run")
-        self._set_peer_data("test_state", "running")
-        self._set_peer_data("test_run_id", test_run_id)
-        self._set_peer_data("scenario_file", scenario)
+        self._set_peer_data_bulk({
+            "test_state": "running",
+            "test_run_id": test_run_id,
+            "scenario_file": scenario,
+        })
 
         # Update runtime config with scenario for workers
         runtime_config = self._read_runtime_config()
@@ -361,7 +534,7 @@ class ChopsticksCharm(ops.CharmBase):
                            duration: str, scenario: str, headless: bool) -> dict:
         """Build the action result dictionary."""
         metrics_dir = DATA_DIR / test_run_id
-        leader_ip = self._get_private_ip()
+        leader_ip = self._private_ip
         web_port = self.config.get("locust-web-port")
 
         result = {
@@ -380,6 +553,7 @@ class ChopsticksCharm(ops.CharmBase):
 
         return result
 
+    @_hook_scoped
     def _on_start_test_action(self, event: ops.ActionEvent) -> None:
         """Start a distributed Locust test."""
         timestamp = datetime.datetime.now().isoformat()
@@ -420,6 +594,7 @@ class ChopsticksCharm(ops.CharmBase):
             self._set_peer_data("test_state", "failed")
             event.fail(f"Failed to start test: {e}")
 
+    @_hook_scoped
     def _on_stop_test_action(self, event: ops.ActionEvent) -> None:
         """Stop the current test."""
         timestamp = datetime.datetime.now().isoformat()
@@ -440,8 +615,7 @@ class ChopsticksCharm(ops.CharmBase):
 
         try:
             logger.debug("_on_stop_test_action: stopping leader services")
-            self._stop_service(LEADER_SERVICE)
-            self._stop_service(LEADER_WEBUI_SERVICE)
+            self._stop_services([LEADER_SERVICE, LEADER_WEBUI_SERVICE])
 
             self._set_peer_data("test_state", "stopped")
             logger.info("_on_stop_test_action: test stopped successfully")
@@ -456,6 +630,7 @@ class ChopsticksCharm(ops.CharmBase):
             logger.error("_on_stop_test_action: failed to stop test: %s", e)
             event.fail(f"Failed to stop test: {e}")
 
+    @_hook_scoped
     def _on_test_status_action(self, event: ops.ActionEvent) -> None:
         """Report test status."""
         logger.debug("_on_test_status_action: gathering status info")
@@ -463,9 +638,10 @@ class ChopsticksCharm(ops.CharmBase):
         test_run_id = self._get_peer_data("test_run_id", "")
         leader_address = self._get_peer_data("leader_address", "")
 
-        leader_running = self._is_service_running(LEADER_SERVICE)
-        leader_webui_running = self._is_service_running(LEADER_WEBUI_SERVICE)
-        worker_running = self._is_service_running(WORKER_SERVICE)
+        running = self._services_running(ALL_SERVICES)
+        leader_running = running[LEADER_SERVICE]
+        leader_webui_running = running[LEADER_WEBUI_SERVICE]
+        worker_running = running[WORKER_SERVICE]
 
         worker_count = self._count_peer_units()
 
@@ -491,6 +667,7 @@ class ChopsticksCharm(ops.CharmBase):
 
         event.set_results(result)
 
+    @_hook_scoped
     def _on_fetch_metrics_action(self, event: ops.ActionEvent) -> None:
         """Fetch metrics from the last test run."""
         logger.debug("_on_fetch_metrics_action: starting, is_leader=%s", self.unit.is_leader())
@@ -515,15 +692,20 @@ class ChopsticksCharm(ops.CharmBase):
         test_state = self._get_peer_data("test_state", "idle")
         output_format = event.params.get("format", "summary")
 
-        files = list(metrics_dir.glob("*"))
-        file_list = [str(f) for f in files]
-        logger.debug("_on_fetch_metrics_action: found %d files: %s", len(files), file_list)
+        # Subdirectories are archived recursively along with the files
+        with os.scandir(metrics_dir) as it:
+            entries = [entry for entry in it if entry.is_file() or entry.is_dir()]
+        file_list = [entry.path for entry in entries]
+        logger.debug("_on_fetch_metrics_action: found %d files: %s", len(entries), file_list)
 
         archive_name = f"testrun-{test_run_id}.tar.gz"
         archive_path = Path("/tmp") / archive_name
-        with tarfile.open(archive_path, "w:gz") as tar:
-            for f in files:
-                tar.add(f, arcname=f.name)
+        try:
+            self._create_archive(archive_path, metrics_dir, [entry.name for entry in entries])
+        except subprocess.CalledProcessError as e:
+            logger.error("Failed to archive metrics: %s", e.stderr)
+            event.fail(f"Failed to create metrics archive: {e}")
+            return
         logger.debug("_on_fetch_metrics_action: created archive %s", archive_path)
 
         scp_command = f"juju scp {self.unit.name}:{archive_path} ."
@@ -546,91 +728,162 @@ class ChopsticksCharm(ops.CharmBase):
                 logger.debug(
                     "_on_fetch_metrics_action: including stats preview from %s", stats_file
                 )
-                result["stats-preview"] = stats_file.read_text()[:2000]
+                with open(stats_file, "r", encoding="utf-8", errors="replace") as f:
+                    result["stats-preview"] = f.read(2000)
 
         event.set_results(result)
 
+    def _create_archive(self, archive_path: Path, base_dir: Path, names: list[str]) -> None:
+        """Write a gzipped tarball of the given files from base_dir.
+
+        GNU tar compresses in C, and pigz spreads the work across cores when
+        installed. Python's tarfile is used when tar is not on PATH, and for an
+        empty file list, which GNU tar refuses to archive.
+        """
+        if names and shutil.which("tar"):
+            if shutil.which("pigz"):
+                cmd = ["tar", "-I", "pigz", "-cf", str(archive_path)]
+            else:
+                cmd = ["tar", "-czf", str(archive_path)]
+            subprocess.run(
+                [*cmd, "-C", str(base_dir), "--", *names], check=True, capture_output=True
+            )
+            return
+        # Stream mode writes the archive sequentially without seeking
+        with tarfile.open(str(archive_path), "w|gz") as tar:
+            for name in names:
+                tar.add(str(base_dir / name), arcname=name)
+
     def _install_system_packages(self) -> None:
-        """Install required system packages."""
+        """Install required system packages.
+
+        Update and install run in one shell so apt starts up only once.
+        """
         packages = ["git", "python3", "python3-venv", "python3-pip", "curl"]
         env = {**os.environ, "DEBIAN_FRONTEND": "noninteractive"}
+        install = " ".join(shlex.quote(p) for p in packages)
         subprocess.run(
-            ["apt-get", "update"],
-            check=True,
-            capture_output=True,
-            env=env,
-        )
-        subprocess.run(
-            ["apt-get", "install", "-y"] + packages,
+            [
+                "sh",
+                "-c",
+                f"apt-get update -qq && apt-get install -y --no-install-recommends {install}",
+            ],
             check=True,
             capture_output=True,
             env=env,
         )
 
     def _clone_repo(self) -> None:
-        """Clone the Chopsticks repository."""
+        """Clone the Chopsticks repository.
+
+        An existing clone of the same remote is updated in place instead of
+        being re-cloned.
+        """
         repo_url = self.config.get("repo-url")
         branch = self.config.get("repo-branch")
 
+        if (REPO_DIR / ".git").is_dir():
+            result = subprocess.run(
+                ["git", "-C", str(REPO_DIR), "remote", "get-url", "origin"],
+                capture_output=True,
+                text=True,
+            )
+            if result.returncode == 0 and result.stdout.strip() == repo_url:
+                logger.debug("_clone_repo: %s already cloned, updating", repo_url)
+                self._update_repo()
+                return
+
         if REPO_DIR.exists():
             shutil.rmtree(REPO_DIR)
 
         REPO_DIR.parent.mkdir(parents=True, exist_ok=True)
 
         subprocess.run(
-            ["git", "clone", "-b", branch, repo_url, str(REPO_DIR)],
+            [
+                "git",
+                "clone",
+                "--depth=1",
+                "--single-branch",
+                "-b",
+                branch,
+                repo_url,
+                str(REPO_DIR),
+            ],
             check=True,
             capture_output=True,
         )
         logger.info("Cloned %s branch %s to %s", repo_url, branch, REPO_DIR)
 
     def _update_repo(self) -> None:
-        """Update the repository if config changed."""
+        """Update the repository if config changed.
+
+        Fetch and checkout run as one shell command to avoid paying git's
+        startup cost once per step.
+        """
         if not REPO_DIR.exists():
             self._clone_repo()
             return
 
         branch = self.config.get("repo-branch")
+        if not BRANCH_PATTERN.match(branch or ""):
+            raise ValueError(f"Invalid repo-branch: {branch!r}")
+
+        repo = shlex.quote(str(REPO_DIR))
+        ref = shlex.quote(branch)
         subprocess.run(
-            ["git", "-C", str(REPO_DIR), "fetch", "origin"],
-            check=True,
-            capture_output=True,
-        )
-        subprocess.run(
-            ["git", "-C", str(REPO_DIR), "checkout", branch],
-            check=True,
-            capture_output=True,
-        )
-        subprocess.run(
-            ["git", "-C", str(REPO_DIR), "pull", "origin", branch],
+            [
+                "bash",
+                "-c",
+                f"git -C {repo} fetch --depth=1 origin {ref} && "
+                f"git -C {repo} checkout -B {ref} FETCH_HEAD",
+            ],
             check=True,
             capture_output=True,
         )
 
     def _setup_venv(self) -> None:
-        """Create virtual environment and install dependencies."""
+        """Create virtual environment and install dependencies.
+
+        Uses uv when it is on PATH; otherwise falls back to the stdlib venv
+        and the pip it bootstraps, without upgrading pip first.
+        """
         if VENV_DIR.exists():
             shutil.rmtree(VENV_DIR)
 
         VENV_DIR.parent.mkdir(parents=True, exist_ok=True)
 
-        subprocess.run(
-            ["python3", "-m", "venv", str(VENV_DIR)],
-            check=True,
-            capture_output=True,
-        )
-
-        pip = VENV_DIR / "bin" / "pip"
-        subprocess.run(
-            [str(pip), "install", "--upgrade", "pip"],
-            check=True,
-            capture_output=True,
-        )
-        subprocess.run(
-            [str(pip), "install", "-e", str(REPO_DIR)],
-            check=True,
-            capture_output=True,
-        )
+        uv = shutil.which("uv")
+        if uv:
+            subprocess.run(
+                [uv, "venv", str(VENV_DIR)],
+                check=True,
+                capture_output=True,
+            )
+            subprocess.run(
+                [
+                    uv,
+                    "pip",
+                    "install",
+                    "--python",
+                    str(VENV_DIR / "bin" / "python"),
+                    "-e",
+                    str(REPO_DIR),
+                ],
+                check=True,
+                capture_output=True,
+            )
+        else:
+            subprocess.run(
+                ["python3", "-m", "venv", str(VENV_DIR)],
+                check=True,
+                capture_output=True,
+            )
+            pip = VENV_DIR / "bin" / "pip"
+            subprocess.run(
+                [str(pip), "install", "-e", str(REPO_DIR)],
+                check=True,
+                capture_output=True,
+            )
         logger.info("Set up venv at %s", VENV_DIR)
 
     def _install_s5cmd(self) -> None:
@@ -665,38 +918,44 @@ class ChopsticksCharm(ops.CharmBase):
         extra_yaml = self.config.get("s3-driver-config-yaml")
         if extra_yaml:
             try:
-                config["driver_config"] = yaml.safe_load(extra_yaml)
+                config["driver_config"] = yaml.load(extra_yaml, Loader=SafeLoader)
             except yaml.YAMLError as e:
                 logger.warning("Invalid driver config YAML: %s", e)
 
         CONFIG_DIR.mkdir(parents=True, exist_ok=True)
         os.chmod(CONFIG_DIR, 0o700)
 
-        with open(S3_CONFIG_PATH, "w") as f:
-            yaml.safe_dump(config, f)
-        os.chmod(S3_CONFIG_PATH, 0o600)
-
-        logger.info("Rendered S3 config to %s", S3_CONFIG_PATH)
+        content = yaml.dump(config, Dumper=SafeDumper)
+        if _write_if_changed(S3_CONFIG_PATH, content, mode=0o600):
+            logger.info("Rendered S3 config to %s", S3_CONFIG_PATH)
+        else:
+            logger.debug("S3 config unchanged at %s", S3_CONFIG_PATH)
 
     def _is_config_valid(self) -> bool:
-        """Check if required S3 configuration is present."""
-        required = ["s3-endpoint", "s3-access-key", "s3-secret-key"]
-        return all(self.config.get(key) for key in required)
+        """Check if required S3 configuration is present (memoized per hook)."""
+        if self._config_valid is None:
+            self._config_valid = all(self.config.get(key) for key in REQUIRED_S3_KEYS)
+        return self._config_valid
 
     def _publish_leader_address(self) -> None:
         """Publish leader address to peer relation and runtime config."""
         if not self.unit.is_leader():
             return
 
-        leader_ip = self._get_private_ip()
+        leader_ip = self._private_ip
         if leader_ip:
-            self._set_peer_data("leader_address", leader_ip)
-            self._set_peer_data("leader_unit", self.unit.name)
+            published = self._set_peer_data_bulk(
+                {"leader_address": leader_ip, "leader_unit": self.unit.name}
+            )
             self._write_runtime_config({"leader_host": leader_ip})
+            # Without the peer relation nothing reached workers; retry on cluster events
+            if published:
+                self._stored.last_published_leader = leader_ip
             logger.info("Published leader address: %s", leader_ip)
 
-    def _get_private_ip(self) -> str:
-        """Get this unit's private IP address."""
+    @functools.cached_property
+    def _private_ip(self) -> str:
+        """This unit's private IP address."""
         try:
             binding = self.model.get_binding("cluster")
             if binding and binding.network.ingress_address:
@@ -755,32 +1014,37 @@ class ChopsticksCharm(ops.CharmBase):
         logger.debug("_count_peer_units: %d peer units", count)
         return count
 
-    def _set_ready_status(self) -> None:
-        """Set appropriate ready status based on role."""
-        logger.debug("_set_ready_status: is_leader=%s", self.unit.is_leader())
+    def _on_collect_unit_status(self, event: ops.CollectStatusEvent) -> None:
+        """Set the unit status once, at the end of every hook."""
+        if self._error_status:
+            event.add_status(self._error_status)
+        event.add_status(self._ready_status())
+
+    def _ready_status(self) -> ops.StatusBase:
+        """Compute the ready status based on role."""
+        logger.debug("_ready_status: is_leader=%s", self.unit.is_leader())
         if not self._is_config_valid():
-            logger.debug("_set_ready_status: config not valid, setting blocked")
-            self.unit.status = ops.BlockedStatus("Missing S3 configuration")
-            return
+            logger.debug("_ready_status: config not valid, blocked")
+            return ops.BlockedStatus("Missing S3 configuration")
 
         test_state = self._get_peer_data("test_state", "idle")
 
         if self.unit.is_leader():
             worker_count = self._count_peer_units()
             status_msg = f"Leader ready ({worker_count} workers, test: {test_state})"
-            logger.debug("_set_ready_status: leader status=%s", status_msg)
-            self.unit.status = ops.ActiveStatus(status_msg)
-        else:
-            leader_address = self._get_peer_data("leader_address", "")
-            if leader_address:
-                worker_running = self._is_service_running(WORKER_SERVICE)
-                status = "connected" if worker_running else "ready"
-                status_msg = f"Worker {status} -> {leader_address}"
-                logger.debug("_set_ready_status: worker status=%s", status_msg)
-                self.unit.status = ops.ActiveStatus(status_msg)
-            else:
-                logger.debug("_set_ready_status: waiting for leader address")
-                self.unit.status = ops.WaitingStatus("Waiting for leader address")
+            logger.debug("_ready_status: leader status=%s", status_msg)
+            return ops.ActiveStatus(status_msg)
+
+        leader_address = self._get_peer_data("leader_address", "")
+        if not leader_address:
+            logger.debug("_ready_status: waiting for leader address")
+            return ops.WaitingStatus("Waiting for leader address")
+
+        worker_running = self._is_service_running(WORKER_SERVICE)
+        status = "connected" if worker_running else "ready"
+        status_msg = f"Worker {status} -> {leader_address}"
+        logger.debug("_ready_status: worker status=%s", status_msg)
+        return ops.ActiveStatus(status_msg)
 
     def _leader_service_content(
         self,
@@ -802,56 +1066,22 @@ class ChopsticksCharm(ops.CharmBase):
             duration: Test duration (required if headless=True)
         """
         scenario_path = REPO_DIR / scenario_file
-        
         description = "Chopsticks Locust Leader" + (" with Web UI" if not headless else "")
-        env_vars = [
-            f"Environment=PATH={VENV_DIR}/bin:/usr/local/bin:/usr/bin:/bin",
-            f"Environment=CHOPSTICKS_SCENARIO_FILE={scenario_path}",
-        ]
-        
-        exec_args = [
-            f"{VENV_DIR}/bin/chopsticks run \\",
-            f"    --workload-config={S3_CONFIG_PATH} \\",
-            f"    -f {scenario_path} \\",
-            "    --leader",
-        ]
-        
-        if headless:
-            metrics_dir = DATA_DIR / test_run_id
-            env_vars.extend([
-                f"Environment=CHOPSTICKS_RUN_DIR={metrics_dir}",
-                f"Environment=CHOPSTICKS_USERS={users}",
-                f"Environment=CHOPSTICKS_SPAWN_RATE={spawn_rate}",
-                f"Environment=CHOPSTICKS_DURATION={duration}",
-            ])
-            exec_args[-1] = exec_args[-1] + " \\"
-            exec_args.extend([
-                "    --headless \\",
-                f"    --users={users} \\",
-                f"    --spawn-rate={spawn_rate} \\",
-                f"    --duration={duration}",
-            ])
-        
-        env_section = "\n".join(env_vars)
-        exec_start = "\n".join(exec_args)
-
-        return f"""[Unit]
-Description={description}
-After=network.target
 
-[Service]
-Type=simple
-User=root
-WorkingDirectory={REPO_DIR}
-{env_section}
-ExecStart={exec_start}
-Restart=no
-StandardOutput=journal
-StandardError=journal
+        headless_env = headless_args = ""
+        if headless:
+            params = {"users": users, "spawn_rate": spawn_rate, "duration": duration}
+            headless_env = LEADER_HEADLESS_ENV_TEMPLATE.substitute(
+                metrics_dir=DATA_DIR / test_run_id, **params
+            )
+            headless_args = LEADER_HEADLESS_ARGS_TEMPLATE.substitute(**params)
 
-[Install]
-WantedBy=multi-user.target
-"""
+        return LEADER_UNIT_TEMPLATE.substitute(
+            description=description,
+            scenario_path=scenario_path,
+            headless_env=headless_env,
+            headless_args=headless_args,
+        )
 
     def _worker_service_content(self) -> str:
         """Generate systemd unit content for the worker service.
@@ -859,32 +1089,12 @@ WantedBy=multi-user.target
         The worker service is static - it reads runtime parameters from
         /etc/chopsticks/runtime.yaml or environment variables.
         """
-        return f"""[Unit]
-Description=Chopsticks Locust Worker
-After=network.target
-
-[Service]
-Type=simple
-User=root
-WorkingDirectory={REPO_DIR}
-Environment=PATH={VENV_DIR}/bin:/usr/local/bin:/usr/bin:/bin
-ExecStart={VENV_DIR}/bin/chopsticks run \\
-    --workload-config={S3_CONFIG_PATH} \\
-    --worker
-Restart=on-failure
-RestartSec=5
-StandardOutput=journal
-StandardError=journal
-
-[Install]
-WantedBy=multi-user.target
-"""
+        return WORKER_UNIT_CONTENT
 
     def _install_systemd_units(self) -> None:
         """Install static systemd units that don't change."""
         # Render the static worker service once
         self._render_worker_service()
-        subprocess.run(["systemctl", "daemon-reload"], check=True, capture_output=True)
 
     def _update_systemd_units(self) -> None:
         """Update runtime configuration for workers."""
@@ -909,34 +1119,65 @@ WantedBy=multi-user.target
         duration: str,
     ) -> None:
         """Render and install the headless leader systemd service file."""
-        content = self._leader_service_content(
-            scenario_file=scenario_file,
-            headless=True,
-            test_run_id=test_run_id,
-            users=users,
-            spawn_rate=spawn_rate,
-            duration=duration,
+        self._render_unit(
+            LEADER_SERVICE,
+            (test_run_id, scenario_file, users, spawn_rate, duration),
+            lambda: self._leader_service_content(
+                scenario_file=scenario_file,
+                headless=True,
+                test_run_id=test_run_id,
+                users=users,
+                spawn_rate=spawn_rate,
+                duration=duration,
+            ),
         )
-        service_path = SYSTEMD_DIR / f"{LEADER_SERVICE}.service"
-        service_path.write_text(content)
-        subprocess.run(["systemctl", "daemon-reload"], check=True, capture_output=True)
 
     def _render_leader_webui_service(self, scenario_file: str) -> None:
         """Render and install the leader with web UI systemd service file."""
-        content = self._leader_service_content(scenario_file=scenario_file, headless=False)
-        service_path = SYSTEMD_DIR / f"{LEADER_WEBUI_SERVICE}.service"
-        service_path.write_text(content)
-        subprocess.run(["systemctl", "daemon-reload"], check=True, capture_output=True)
+        self._render_unit(
+            LEADER_WEBUI_SERVICE,
+            (scenario_file,),
+            lambda: self._leader_service_content(scenario_file=scenario_file, headless=False),
+        )
 
     def _render_worker_service(self) -> None:
         """Render and install the worker systemd service file."""
-        content = self._worker_service_content()
-        service_path = SYSTEMD_DIR / f"{WORKER_SERVICE}.service"
-        service_path.write_text(content)
+        self._render_unit(WORKER_SERVICE, (), self._worker_service_content)
+
+    def _render_unit(self, service: str, inputs: tuple, render: Callable[[], str]) -> None:
+        """Render and install a unit file unless it was already rendered from the same inputs."""
+        if self._rendered_units.get(service) == inputs:
+            logger.debug("_render_unit: %s already rendered, skipping", service)
+            return
+        self._install_unit_file(service, render())
+        self._rendered_units[service] = inputs
+
+    def _install_unit_file(self, service: str, content: str) -> bool:
+        """Write a unit file, unless its content is unchanged.
+
+        A daemon-reload is queued rather than run, so several units rendered
+        in one hook cost a single reload in _flush_daemon_reload.
+
+        Returns:
+            True if the unit file was written
+        """
+        service_path = SYSTEMD_DIR / f"{service}.service"
+        if not _write_if_changed(service_path, content):
+            logger.debug("_install_unit_file: %s unchanged, skipping daemon-reload", service)
+            return False
+        self._pending_daemon_reload = True
+        return True
+
+    def _flush_daemon_reload(self) -> None:
+        """Run one systemctl daemon-reload if any unit file changed."""
+        if not self._pending_daemon_reload:
+            return
         subprocess.run(["systemctl", "daemon-reload"], check=True, capture_output=True)
+        self._pending_daemon_reload = False
 
     def _start_service(self, service: str) -> None:
         """Start a systemd service."""
+        self._flush_daemon_reload()
         logger.debug("_start_service: starting %s", service)
         subprocess.run(
             ["systemctl", "start", f"{service}.service"],
@@ -947,23 +1188,72 @@ WantedBy=multi-user.target
 
     def _stop_service(self, service: str) -> None:
         """Stop a systemd service (ignore if not running)."""
-        logger.debug("_stop_service: stopping %s", service)
+        self._stop_services([service])
+
+    def _stop_services(self, services: Sequence[str]) -> None:
+        """Stop several systemd services with one systemctl call (ignore if not running)."""
+        logger.debug("_stop_services: stopping %s", services)
         subprocess.run(
-            ["systemctl", "stop", f"{service}.service"],
+            ["systemctl", "stop", *(f"{s}.service" for s in services)],
             capture_output=True,
         )
-        logger.debug("_stop_service: stopped %s", service)
+        logger.debug("_stop_services: stopped %s", services)
 
     def _is_service_running(self, service: str) -> bool:
         """Check if a systemd service is running."""
+        return self._services_running([service])[service]
+
+    def _open_systemd_bus(self):
+        """Return a system bus connection shared by the hook, or None without D-Bus.
+
+        A failed connection is remembered so later checks in the same hook go
+        straight to systemctl instead of retrying the bus.
+        """
+        if self._systemd_bus is None:
+            self._systemd_bus = False
+            if DBus is not None:
+                try:
+                    bus = DBus()
+                    bus.open()
+                    self._systemd_bus = bus
+                except Exception as e:
+                    logger.debug("_open_systemd_bus: D-Bus unavailable: %s", e)
+        return self._systemd_bus or None
+
+    def _unit_active_state(self, bus, service: str) -> bool:
+        """Return whether a service's ActiveState, read over D-Bus, is active."""
+        unit = Unit(f"{service}.service", bus=bus, _autoload=True)
+        return unit.Unit.ActiveState == b"active"
+
+    def _services_running(self, services: Sequence[str]) -> dict[str, bool]:
+        """Check several systemd services.
+
+        Reads each unit's ActiveState over D-Bus when pystemd is available,
+        otherwise makes one `systemctl is-active` call, which prints one
+        state per unit in argument order.
+        """
+        bus = self._open_systemd_bus()
+        if bus:
+            try:
+                running = {service: self._unit_active_state(bus, service) for service in services}
+                logger.debug("_services_running(%s) = %s (D-Bus)", services, running)
+                return running
+            except Exception as e:
+                logger.debug("_services_running: D-Bus query failed, using systemctl: %s", e)
+                self._systemd_bus = False
+
         result = subprocess.run(
-            ["systemctl", "is-active", f"{service}.service"],
+            ["systemctl", "is-active", *(f"{s}.service" for s in services)],
             capture_output=True,
             text=True,
         )
-        is_running = result.returncode == 0
-        logger.debug("_is_service_running(%s) = %s", service, is_running)
-        return is_running
+        states = result.stdout.splitlines()
+        running = {
+            service: index < len(states) and states[index].strip() == "active"
+            for index, service in enumerate(services)
+        }
+        logger.debug("_services_running(%s) = %s", services, running)
+        return running
 
     def _read_runtime_config(self) -> dict:
         """Read runtime configuration."""
@@ -971,7 +1261,7 @@ WantedBy=multi-user.target
             return {}
         try:
             with open(RUNTIME_CONFIG_PATH, "r") as f:
-                return yaml.safe_load(f) or {}
+                return yaml.load(f, Loader=SafeLoader) or {}
         except Exception as e:
             logger.warning("Failed to read runtime config: %s", e)
             return {}
@@ -981,7 +1271,7 @@ WantedBy=multi-user.target
         try:
             CONFIG_DIR.mkdir(parents=True, exist_ok=True)
             with open(RUNTIME_CONFIG_PATH, "w") as f:
-                yaml.safe_dump(config, f)
+                yaml.dump(config, f, Dumper=SafeDumper)
             logger.debug("Wrote runtime config: %s", config)
         except Exception as e:
             logger.warning("Failed to write runtime config: %s", e)
@@ -989,8 +1279,7 @@ WantedBy=multi-user.target
     def _stop_all_services(self) -> None:
         """Stop all Chopsticks services."""
         logger.debug("_stop_all_services: stopping all services")
-        for service in [LEADER_SERVICE, LEADER_WEBUI_SERVICE, WORKER_SERVICE]:
-            self._stop_service(service)
+        self._stop_services(ALL_SERVICES)
 
 
 if __name__ == "__main__":
@@ -9,6 +9,7 @@ import logging
 import pathlib
 import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 
 import jubilant
 import pytest
@@ -39,6 +40,19 @@ MEDIUM_DURATION = "30s"
 TEST_SCENARIO = "src/chopsticks/scenarios/example_scenario.py"
 
 
+def _wait_for_rgw(juju: jubilant.Juju, timeout: float = 60, unit: str = "microceph/0") -> None:
+    """Poll the RGW endpoint on the MicroCeph unit until it answers or the timeout expires."""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            juju.ssh(unit, "curl -sf -o /dev/null http://localhost:80")
+            return
+        except jubilant.CLIError:
+            if time.monotonic() >= deadline:
+                raise
+            time.sleep(2)
+
+
 @pytest.fixture(scope="module")
 def microceph_s3(juju: jubilant.Juju) -> dict[str, str]:
     """Deploy MicroCeph and configure S3 (RGW).
@@ -56,26 +70,31 @@ def microceph_s3(juju: jubilant.Juju) -> dict[str, str]:
     logger.info("Waiting for MicroCeph to become active...")
     juju.wait(lambda status: status.apps["microceph"].is_active, timeout=600)
 
-    logger.info("Enabling RGW (S3 gateway)...")
-    juju.config("microceph", values={"enable-rgw": "*"})
+    # jubilant is synchronous, so the AWS CLI install runs in a worker thread
+    # while RGW is enabled and polled; neither depends on the other.
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        logger.info("Installing AWS CLI on microceph/0...")
+        aws_cli = pool.submit(juju.ssh, "microceph/0", "sudo snap install aws-cli --classic")
 
-    logger.info("Waiting for RGW to be ready...")
-    time.sleep(30)
+        logger.info("Enabling RGW (S3 gateway)...")
+        juju.config("microceph", values={"enable-rgw": "*"})
 
-    logger.info("Creating S3 user...")
-    user_output = juju.ssh(
-        "microceph/0",
-        "sudo microceph.radosgw-admin user create --uid=test --display-name='Test User'",
-    )
-    user_data = json.loads(user_output)
-    access_key = user_data["keys"][0]["access_key"]
-    secret_key = user_data["keys"][0]["secret_key"]
+        logger.info("Waiting for RGW to be ready...")
+        _wait_for_rgw(juju)
 
-    status = juju.status()
-    microceph_ip = status.apps["microceph"].units["microceph/0"].public_address
+        logger.info("Creating S3 user...")
+        user_output = juju.ssh(
+            "microceph/0",
+            "sudo microceph.radosgw-admin user create --uid=test --display-name='Test User'",
+        )
+        user_data = json.loads(user_output)
+        access_key = user_data["keys"][0]["access_key"]
+        secret_key = user_data["keys"][0]["secret_key"]
+
+        status = juju.status()
+        microceph_ip = status.apps["microceph"].units["microceph/0"].public_address
 
-    logger.info("Installing AWS CLI on microceph/0...")
-    juju.ssh("microceph/0", "sudo snap install aws-cli --classic")
+        aws_cli.result()
 
     logger.info("Creating test bucket...")
     juju.ssh(
@@ -93,6 +112,33 @@ def microceph_s3(juju: jubilant.Juju) -> dict[str, str]:
     }
 
 
+@pytest.fixture(scope="module")
+def chopsticks_deployed(
+    charm: pathlib.Path, juju: jubilant.Juju, microceph_s3: dict[str, str]
+) -> None:
+    """Deploy and configure chopsticks once for every test class that needs it."""
+    if "chopsticks" not in juju.status().apps:
+        juju.deploy(str(charm.resolve()), app="chopsticks", num_units=3)
+
+    logger.info("Configuring S3 credentials...")
+    juju.config(
+        "chopsticks",
+        values={
+            "s3-endpoint": microceph_s3["endpoint"],
+            "s3-access-key": microceph_s3["access_key"],
+            "s3-secret-key": microceph_s3["secret_key"],
+            "s3-bucket": microceph_s3["bucket"],
+            "s3-region": microceph_s3["region"],
+            "scenario-file": TEST_SCENARIO,
+            "locust-loglevel": "DEBUG",
+            "repo-branch": "main",
+        },
+    )
+
+    logger.info("Waiting for active status...")
+    juju.wait(jubilant.all_active, timeout=300)
+
+
 def _get_leader_unit(juju: jubilant.Juju, app: str = "chopsticks") -> str:
     """Get the name of the current leader unit for an application."""
     for unit_name, unit in juju.status().apps[app].units.items():
@@ -101,6 +147,12 @@ def _get_leader_unit(juju: jubilant.Juju, app: str = "chopsticks") -> str:
     raise RuntimeError(f"No leader found for {app}")
 
 
+def _run_on_units(juju: jubilant.Juju, units: list[str], action: str) -> dict[str, jubilant.Task]:
+    """Run an action on several units concurrently and return each unit's task."""
+    with ThreadPoolExecutor(max_workers=len(units)) as pool:
+        return dict(zip(units, pool.map(lambda unit: juju.run(unit, action), units)))
+
+
 class TestBasicDeployment:
     """TC1: Basic Deployment - Verify charm deploys and installs dependencies correctly."""
 
@@ -126,47 +178,20 @@ class TestBasicDeployment:
             )
 
 
+@pytest.mark.usefixtures("chopsticks_deployed")
 class TestLeaderElection:
     """TC2: Leader Election and Peer Discovery."""
 
-    def test_leader_election_and_peer_discovery(
-        self,
-        charm: pathlib.Path,
-        juju: jubilant.Juju,
-        microceph_s3: dict[str, str],
-    ) -> None:
+    def test_leader_election_and_peer_discovery(self, juju: jubilant.Juju) -> None:
         """Verify leader is elected and workers discover leader address."""
-        if "chopsticks" not in juju.status().apps:
-            juju.deploy(str(charm.resolve()), app="chopsticks", num_units=3)
-            juju.wait(
-                lambda status: "chopsticks" in status.apps,
-                timeout=600,
-            )
-
-        logger.info("Configuring S3 credentials...")
-        juju.config(
-            "chopsticks",
-            values={
-                "s3-endpoint": microceph_s3["endpoint"],
-                "s3-access-key": microceph_s3["access_key"],
-                "s3-secret-key": microceph_s3["secret_key"],
-                "s3-bucket": microceph_s3["bucket"],
-                "s3-region": microceph_s3["region"],
-                "scenario-file": TEST_SCENARIO,
-                "locust-loglevel": "DEBUG",
-                "repo-branch": "main",
-            },
-        )
-
-        logger.info("Waiting for active status...")
-        juju.wait(jubilant.all_active, timeout=300)
-
-        logger.info("Verifying leader status via test-status action...")
+        logger.info("Verifying leader status via test-status action on every unit...")
+        status = juju.status()
         leader = _get_leader_unit(juju)
-        result = juju.run(leader, "test-status")
-        assert result.results["is-leader"] == "True"
+        results = _run_on_units(juju, list(status.apps["chopsticks"].units), "test-status")
+        for unit_name, result in results.items():
+            expected = "True" if unit_name == leader else "False"
+            assert result.results["is-leader"] == expected, f"{unit_name} is-leader mismatch"
 
-        status = juju.status()
         leader_unit = None
         for unit_name, unit in status.apps["chopsticks"].units.items():
             if "Leader ready" in unit.workload_status.message:
@@ -182,18 +207,12 @@ class TestLeaderElection:
                 )
 
 
+@pytest.mark.usefixtures("chopsticks_deployed")
 class TestStartTest:
     """TC3: Start Test Action."""
 
-    def test_start_test_action(
-        self,
-        charm: pathlib.Path,
-        juju: jubilant.Juju,
-        microceph_s3: dict[str, str],
-    ) -> None:
+    def test_start_test_action(self, juju: jubilant.Juju) -> None:
         """Verify distributed test execution starts correctly."""
-        self._ensure_deployed_and_configured(charm, juju, microceph_s3)
-
         logger.info("Starting test...")
         leader = _get_leader_unit(juju)
         result = juju.run(
@@ -213,43 +232,15 @@ class TestStartTest:
         logger.info("Waiting for test to complete...")
         time.sleep(25)
 
-    def _ensure_deployed_and_configured(
-        self,
-        charm: pathlib.Path,
-        juju: jubilant.Juju,
-        microceph_s3: dict[str, str],
-    ) -> None:
-        """Ensure chopsticks is deployed and configured."""
-        if "chopsticks" not in juju.status().apps:
-            juju.deploy(str(charm.resolve()), app="chopsticks", num_units=3)
-
-        juju.config(
-            "chopsticks",
-            values={
-                "s3-endpoint": microceph_s3["endpoint"],
-                "s3-access-key": microceph_s3["access_key"],
-                "s3-secret-key": microceph_s3["secret_key"],
-                "s3-bucket": microceph_s3["bucket"],
-                "s3-region": microceph_s3["region"],
-                "scenario-file": TEST_SCENARIO,
-                "locust-loglevel": "DEBUG",
-            },
-        )
-        juju.wait(jubilant.all_active, timeout=300)
-
 
+@pytest.mark.usefixtures("chopsticks_deployed")
 class TestStopTest:
     """TC4: Stop Test Action."""
 
-    def test_stop_test_action(
-        self,
-        charm: pathlib.Path,
-        juju: jubilant.Juju,
-        microceph_s3: dict[str, str],
-    ) -> None:
+    def test_stop_test_action(self, juju: jubilant.Juju) -> None:
         """Verify test can be stopped cleanly."""
         _log_action("TestStopTest", "test_stop_test_action", "START")
-        self._ensure_running_test(charm, juju, microceph_s3)
+        self._ensure_running_test(juju)
 
         _log_action("TestStopTest", "calling stop-test")
         logger.info("Stopping test...")
@@ -262,30 +253,8 @@ class TestStopTest:
         assert status_result.results["test-state"] == "stopped"
         assert status_result.results["leader-running"] == "False"
 
-    def _ensure_running_test(
-        self,
-        charm: pathlib.Path,
-        juju: jubilant.Juju,
-        microceph_s3: dict[str, str],
-    ) -> None:
+    def _ensure_running_test(self, juju: jubilant.Juju) -> None:
         """Ensure a test is running."""
-        if "chopsticks" not in juju.status().apps:
-            juju.deploy(str(charm.resolve()), app="chopsticks", num_units=3)
-
-        juju.config(
-            "chopsticks",
-            values={
-                "s3-endpoint": microceph_s3["endpoint"],
-                "s3-access-key": microceph_s3["access_key"],
-                "s3-secret-key": microceph_s3["secret_key"],
-                "s3-bucket": microceph_s3["bucket"],
-                "s3-region": microceph_s3["region"],
-                "scenario-file": TEST_SCENARIO,
-                "locust-loglevel": "DEBUG",
-            },
-        )
-        juju.wait(jubilant.all_active, timeout=300)
-
         leader = _get_leader_unit(juju)
         status_result = juju.run(leader, "test-status")
         test_state = status_result.results["test-state"]
@@ -306,18 +275,13 @@ class TestStopTest:
             )
 
 
+@pytest.mark.usefixtures("chopsticks_deployed")
 class TestFetchMetrics:
     """TC5: Fetch Metrics Action."""
 
-    def test_fetch_metrics_action(
-        self,
-        charm: pathlib.Path,
-        juju: jubilant.Juju,
-        microceph_s3: dict[str, str],
-    ) -> None:
+    def test_fetch_metrics_action(self, juju: jubilant.Juju) -> None:
         """Verify metrics are collected and retrievable."""
         _log_action("TestFetchMetrics", "test_fetch_metrics_action", "START")
-        self._ensure_deployed_and_configured(charm, juju, microceph_s3)
 
         _log_action("TestFetchMetrics", "calling start-test", f"duration={SHORT_DURATION}")
         logger.info("Running a short test...")
@@ -349,43 +313,14 @@ class TestFetchMetrics:
             "Should have metrics or report files"
         )
 
-    def _ensure_deployed_and_configured(
-        self,
-        charm: pathlib.Path,
-        juju: jubilant.Juju,
-        microceph_s3: dict[str, str],
-    ) -> None:
-        """Ensure chopsticks is deployed and configured."""
-        if "chopsticks" not in juju.status().apps:
-            juju.deploy(str(charm.resolve()), app="chopsticks", num_units=3)
-
-        juju.config(
-            "chopsticks",
-            values={
-                "s3-endpoint": microceph_s3["endpoint"],
-                "s3-access-key": microceph_s3["access_key"],
-                "s3-secret-key": microceph_s3["secret_key"],
-                "s3-bucket": microceph_s3["bucket"],
-                "s3-region": microceph_s3["region"],
-                "scenario-file": TEST_SCENARIO,
-                "locust-loglevel": "DEBUG",
-            },
-        )
-        juju.wait(jubilant.all_active, timeout=300)
-
 
+@pytest.mark.usefixtures("chopsticks_deployed")
 class TestDynamicScaling:
     """TC6: Dynamic Scaling."""
 
-    def test_dynamic_scaling(
-        self,
-        charm: pathlib.Path,
-        juju: jubilant.Juju,
-        microceph_s3: dict[str, str],
-    ) -> None:
+    def test_dynamic_scaling(self, juju: jubilant.Juju) -> None:
         """Verify adding units increases worker count."""
         _log_action("TestDynamicScaling", "test_dynamic_scaling", "START")
-        self._ensure_deployed_and_configured(charm, juju, microceph_s3)
 
         logger.info("Getting initial worker count...")
         leader = _get_leader_unit(juju)
@@ -415,43 +350,15 @@ class TestDynamicScaling:
                     or "ready" in unit.workload_status.message.lower()
                 ), f"{unit_name} should show connected or ready status"
 
-    def _ensure_deployed_and_configured(
-        self,
-        charm: pathlib.Path,
-        juju: jubilant.Juju,
-        microceph_s3: dict[str, str],
-    ) -> None:
-        """Ensure chopsticks is deployed and configured."""
-        if "chopsticks" not in juju.status().apps:
-            juju.deploy(str(charm.resolve()), app="chopsticks", num_units=3)
-
-        juju.config(
-            "chopsticks",
-            values={
-                "s3-endpoint": microceph_s3["endpoint"],
-                "s3-access-key": microceph_s3["access_key"],
-                "s3-secret-key": microceph_s3["secret_key"],
-                "s3-bucket": microceph_s3["bucket"],
-                "s3-region": microceph_s3["region"],
-                "scenario-file": TEST_SCENARIO,
-                "locust-loglevel": "DEBUG",
-            },
-        )
-        juju.wait(jubilant.all_active, timeout=300)
-
 
+@pytest.mark.usefixtures("chopsticks_deployed")
 class TestPreventDuplicateTests:
     """TC7: Prevent Duplicate Tests."""
 
-    def test_prevent_duplicate_tests(
-        self,
-        charm: pathlib.Path,
-        juju: jubilant.Juju,
-        microceph_s3: dict[str, str],
-    ) -> None:
+    def test_prevent_duplicate_tests(self, juju: jubilant.Juju) -> None:
         """Verify only one test can run at a time."""
         _log_action("TestPreventDuplicateTests", "test_prevent_duplicate_tests", "START")
-        self._ensure_deployed_and_configured(charm, juju, microceph_s3)
+        self._ensure_idle(juju)
 
         _log_action("TestPreventDuplicateTests", "calling start-test (first)")
         logger.info("Starting first test...")
@@ -480,54 +387,26 @@ class TestPreventDuplicateTests:
         logger.info("Stopping the test...")
         juju.run(leader, "stop-test")
 
-    def _ensure_deployed_and_configured(
-        self,
-        charm: pathlib.Path,
-        juju: jubilant.Juju,
-        microceph_s3: dict[str, str],
-    ) -> None:
-        """Ensure chopsticks is deployed and configured."""
-        if "chopsticks" not in juju.status().apps:
-            juju.deploy(str(charm.resolve()), app="chopsticks", num_units=3)
-
-        juju.config(
-            "chopsticks",
-            values={
-                "s3-endpoint": microceph_s3["endpoint"],
-                "s3-access-key": microceph_s3["access_key"],
-                "s3-secret-key": microceph_s3["secret_key"],
-                "s3-bucket": microceph_s3["bucket"],
-                "s3-region": microceph_s3["region"],
-                "scenario-file": TEST_SCENARIO,
-                "locust-loglevel": "DEBUG",
-            },
-        )
-        juju.wait(jubilant.all_active, timeout=300)
-
+    def _ensure_idle(self, juju: jubilant.Juju) -> None:
+        """Ensure no test is running."""
         leader = _get_leader_unit(juju)
         status_result = juju.run(leader, "test-status")
         test_state = status_result.results["test-state"]
         if test_state == "running":
             _log_action(
                 "TestPreventDuplicateTests",
-                "_ensure: calling stop-test",
+                "_ensure_idle: calling stop-test",
                 f"test_state={test_state}",
             )
             juju.run(leader, "stop-test")
 
 
+@pytest.mark.usefixtures("chopsticks_deployed")
 class TestActionRestrictions:
     """TC8: Action Restrictions."""
 
-    def test_action_restrictions(
-        self,
-        charm: pathlib.Path,
-        juju: jubilant.Juju,
-        microceph_s3: dict[str, str],
-    ) -> None:
+    def test_action_restrictions(self, juju: jubilant.Juju) -> None:
         """Verify actions are restricted to appropriate units."""
-        self._ensure_deployed_and_configured(charm, juju, microceph_s3)
-
         status = juju.status()
         non_leader_unit = None
         for unit_name, unit in status.apps["chopsticks"].units.items():
@@ -550,27 +429,3 @@ class TestActionRestrictions:
         logger.info("Testing test-status on non-leader %s (should work)...", non_leader_unit)
         result = juju.run(non_leader_unit, "test-status")
         assert result.results["is-leader"] == "False"
-
-    def _ensure_deployed_and_configured(
-        self,
-        charm: pathlib.Path,
-        juju: jubilant.Juju,
-        microceph_s3: dict[str, str],
-    ) -> None:
-        """Ensure chopsticks is deployed and configured."""
-        if "chopsticks" not in juju.status().apps:
-            juju.deploy(str(charm.resolve()), app="chopsticks", num_units=3)
-
-        juju.config(
-            "chopsticks",
-            values={
-                "s3-endpoint": microceph_s3["endpoint"],
-                "s3-access-key": microceph_s3["access_key"],
-                "s3-secret-key": microceph_s3["secret_key"],
-                "s3-bucket": microceph_s3["bucket"],
-                "s3-region": microceph_s3["region"],
-                "scenario-file": TEST_SCENARIO,
-                "locust-loglevel": "DEBUG",
-            },
-        )
-        juju.wait(jubilant.all_active, timeout=300)
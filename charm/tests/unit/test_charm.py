@@ -3,9 +3,15 @@
 
 """Unit tests for the Chopsticks charm."""
 
+import pathlib
+import re
+import subprocess
+import tarfile
+
 import pytest
 from ops import testing
 
+import charm
 from charm import ChopsticksCharm
 
 
@@ -34,6 +40,7 @@ def test_start_without_config_sets_blocked_status(harness: testing.Harness):
     """Test that start without S3 config sets BlockedStatus."""
     harness.begin()
     harness.charm.on.start.emit()
+    harness.evaluate_status()
     assert harness.charm.unit.status.name == "blocked"
     assert "Missing S3 configuration" in harness.charm.unit.status.message
 
@@ -46,6 +53,7 @@ def test_start_with_valid_config_sets_waiting_status(
     harness.add_relation("cluster", "chopsticks")
     harness.begin()
     harness.charm.on.start.emit()
+    harness.evaluate_status()
     assert harness.charm.unit.status.name == "waiting"
     assert "Waiting for leader address" in harness.charm.unit.status.message
 
@@ -57,6 +65,7 @@ def test_start_as_leader_sets_active_status(harness: testing.Harness, valid_s3_c
     harness.add_relation("cluster", "chopsticks")
     harness.begin()
     harness.charm.on.start.emit()
+    harness.evaluate_status()
     assert harness.charm.unit.status.name == "active"
     assert "Leader ready" in harness.charm.unit.status.message
 
@@ -68,47 +77,34 @@ def test_is_config_valid_with_all_required_fields(harness: testing.Harness, vali
     assert harness.charm._is_config_valid() is True
 
 
-def test_is_config_valid_missing_endpoint(harness: testing.Harness, valid_s3_config: dict):
-    """Test _is_config_valid returns False when endpoint missing."""
-    del valid_s3_config["s3-endpoint"]
-    harness.update_config(valid_s3_config)
-    harness.begin()
-    assert harness.charm._is_config_valid() is False
-
-
-def test_is_config_valid_missing_access_key(harness: testing.Harness, valid_s3_config: dict):
-    """Test _is_config_valid returns False when access key missing."""
-    del valid_s3_config["s3-access-key"]
-    harness.update_config(valid_s3_config)
-    harness.begin()
-    assert harness.charm._is_config_valid() is False
-
-
-def test_is_config_valid_missing_secret_key(harness: testing.Harness, valid_s3_config: dict):
-    """Test _is_config_valid returns False when secret key missing."""
-    del valid_s3_config["s3-secret-key"]
+@pytest.mark.parametrize("key", ["s3-endpoint", "s3-access-key", "s3-secret-key"])
+def test_is_config_valid_missing_key(harness: testing.Harness, valid_s3_config: dict, key: str):
+    """Test _is_config_valid returns False when a required key is missing."""
+    del valid_s3_config[key]
     harness.update_config(valid_s3_config)
     harness.begin()
     assert harness.charm._is_config_valid() is False
 
 
-def test_is_config_valid_empty_endpoint(harness: testing.Harness, valid_s3_config: dict):
-    """Test _is_config_valid returns False when endpoint is empty string."""
-    valid_s3_config["s3-endpoint"] = ""
+@pytest.mark.parametrize("key", ["s3-endpoint", "s3-access-key", "s3-secret-key"])
+def test_is_config_valid_empty_key(harness: testing.Harness, valid_s3_config: dict, key: str):
+    """Test _is_config_valid returns False when a required key is an empty string."""
+    valid_s3_config[key] = ""
     harness.update_config(valid_s3_config)
     harness.begin()
     assert harness.charm._is_config_valid() is False
 
 
-def test_start_test_action_fails_on_non_leader(harness: testing.Harness, valid_s3_config: dict):
-    """Test start-test action fails when not run on leader."""
+@pytest.mark.parametrize("action", ["start-test", "stop-test", "fetch-metrics"])
+def test_action_fails_on_non_leader(harness: testing.Harness, valid_s3_config: dict, action: str):
+    """Test leader-only actions fail when not run on leader."""
     harness.set_leader(False)
     harness.update_config(valid_s3_config)
     harness.add_relation("cluster", "chopsticks")
     harness.begin()
 
     with pytest.raises(testing.ActionFailed) as exc_info:
-        harness.run_action("start-test")
+        harness.run_action(action)
     assert "leader" in str(exc_info.value).lower()
 
 
@@ -153,30 +149,6 @@ def test_start_test_action_fails_with_invalid_users(
     assert "numeric" in str(exc_info.value)
 
 
-def test_stop_test_action_fails_on_non_leader(harness: testing.Harness, valid_s3_config: dict):
-    """Test stop-test action fails when not run on leader."""
-    harness.set_leader(False)
-    harness.update_config(valid_s3_config)
-    harness.add_relation("cluster", "chopsticks")
-    harness.begin()
-
-    with pytest.raises(testing.ActionFailed) as exc_info:
-        harness.run_action("stop-test")
-    assert "leader" in str(exc_info.value).lower()
-
-
-def test_fetch_metrics_action_fails_on_non_leader(harness: testing.Harness, valid_s3_config: dict):
-    """Test fetch-metrics action fails when not run on leader."""
-    harness.set_leader(False)
-    harness.update_config(valid_s3_config)
-    harness.add_relation("cluster", "chopsticks")
-    harness.begin()
-
-    with pytest.raises(testing.ActionFailed) as exc_info:
-        harness.run_action("fetch-metrics")
-    assert "leader" in str(exc_info.value).lower()
-
-
 def test_fetch_metrics_action_fails_without_test_run(
     harness: testing.Harness, valid_s3_config: dict
 ):
@@ -238,47 +210,50 @@ def test_maybe_start_worker_skipped_without_leader_address(
     harness.charm._maybe_start_worker()
 
 
+def _unit_matcher(*needles: str) -> re.Pattern:
+    """Compile one pattern that finds all needles, in order, in a unit file."""
+    return re.compile(".*".join(map(re.escape, needles)), re.DOTALL)
+
+
 def test_leader_service_content_generates_valid_unit(
     harness: testing.Harness, valid_s3_config: dict
 ):
-    """Test _leader_service_content generates valid systemd unit."""
-    valid_s3_config["locust-master-port"] = 5557
+    """Test _leader_service_content generates valid headless systemd unit."""
     harness.update_config(valid_s3_config)
     harness.begin()
 
     content = harness.charm._leader_service_content(
-        test_run_id="test-123",
         scenario_file="scenarios/test.py",
+        headless=True,
+        test_run_id="test-123",
         users=10,
         spawn_rate=2.0,
         duration="5m",
     )
-    assert "[Unit]" in content
-    assert "[Service]" in content
-    assert "[Install]" in content
-    assert "--leader" in content
-    assert "--headless" in content
-    assert "--users=10" in content
-    assert "--spawn-rate=2.0" in content
-    assert "--duration=5m" in content
-    assert "test-123" in content
+    assert _unit_matcher(
+        "[Unit]",
+        "[Service]",
+        "test-123",
+        "--leader",
+        "--headless",
+        "--users=10",
+        "--spawn-rate=2.0",
+        "--duration=5m",
+        "[Install]",
+    ).search(content)
 
 
 def test_leader_webui_service_content_generates_valid_unit(
     harness: testing.Harness, valid_s3_config: dict
 ):
-    """Test _leader_webui_service_content generates valid systemd unit."""
-    valid_s3_config["locust-master-port"] = 5557
-    valid_s3_config["locust-web-port"] = 8089
+    """Test _leader_service_content generates valid web UI systemd unit."""
     harness.update_config(valid_s3_config)
     harness.begin()
 
-    content = harness.charm._leader_webui_service_content(
-        scenario_file="scenarios/test.py",
+    content = harness.charm._leader_service_content(
+        scenario_file="scenarios/test.py", headless=False
     )
-    assert "[Unit]" in content
-    assert "[Service]" in content
-    assert "--leader" in content
+    assert _unit_matcher("[Unit]", "Web UI", "[Service]", "--leader", "[Install]").search(content)
     assert "--headless" not in content
 
 
@@ -286,25 +261,26 @@ def test_worker_service_content_generates_valid_unit(
     harness: testing.Harness, valid_s3_config: dict
 ):
     """Test _worker_service_content generates valid systemd unit."""
-    valid_s3_config["locust-master-port"] = 5557
-    valid_s3_config["scenario-file"] = "scenarios/default.py"
     harness.update_config(valid_s3_config)
     harness.add_relation("cluster", "chopsticks")
     harness.begin()
 
-    content = harness.charm._worker_service_content(leader_host="10.0.0.1")
-    assert "[Unit]" in content
-    assert "[Service]" in content
-    assert "--worker" in content
-    assert "--leader-host=10.0.0.1" in content
+    content = harness.charm._worker_service_content()
+    assert _unit_matcher(
+        "[Unit]", "[Service]", f"--workload-config={charm.S3_CONFIG_PATH}", "--worker", "[Install]"
+    ).search(content)
+    # The leader address comes from the runtime config, not the unit file
+    assert "--leader-host" not in content
 
 
-def test_worker_service_content_uses_peer_data_scenario(
-    harness: testing.Harness, valid_s3_config: dict
+def test_worker_runtime_config_uses_peer_data_scenario(
+    harness: testing.Harness, valid_s3_config: dict, tmp_path, monkeypatch: pytest.MonkeyPatch
 ):
-    """Test _worker_service_content prefers scenario from peer data."""
-    valid_s3_config["locust-master-port"] = 5557
+    """Test the worker runtime config prefers the scenario from peer data."""
+    monkeypatch.setattr(charm, "CONFIG_DIR", tmp_path)
+    monkeypatch.setattr(charm, "RUNTIME_CONFIG_PATH", tmp_path / "runtime.yaml")
     valid_s3_config["scenario-file"] = "scenarios/default.py"
+    valid_s3_config["autostart-workers"] = False
     harness.update_config(valid_s3_config)
     rel_id = harness.add_relation("cluster", "chopsticks")
     harness.begin()
@@ -312,9 +288,390 @@ def test_worker_service_content_uses_peer_data_scenario(
     harness.update_relation_data(
         rel_id,
         harness.charm.app.name,
-        {"scenario_file": "scenarios/override.py"},
+        {"leader_address": "10.0.0.1", "scenario_file": "scenarios/override.py"},
     )
 
-    content = harness.charm._worker_service_content(leader_host="10.0.0.1")
-    assert "scenarios/override.py" in content
-    assert "scenarios/default.py" not in content
+    harness.charm._update_systemd_units()
+    assert harness.charm._read_runtime_config() == {
+        "leader_host": "10.0.0.1",
+        "scenario_file": "scenarios/override.py",
+    }
+
+
+def test_test_status_action_queries_services_once(
+    harness: testing.Harness, valid_s3_config: dict, monkeypatch: pytest.MonkeyPatch
+):
+    """Test test-status action checks all services with a single systemctl call."""
+    harness.set_leader(True)
+    harness.update_config(valid_s3_config)
+    harness.add_relation("cluster", "chopsticks")
+    harness.begin()
+
+    calls = []
+
+    def fake_run(cmd, **kwargs):
+        calls.append(cmd)
+        return subprocess.CompletedProcess(cmd, 3, stdout="inactive\nactive\ninactive\n")
+
+    monkeypatch.setattr(subprocess, "run", fake_run)
+
+    result = harness.run_action("test-status")
+    assert calls == [
+        [
+            "systemctl",
+            "is-active",
+            "chopsticks-leader.service",
+            "chopsticks-leader-webui.service",
+            "chopsticks-worker.service",
+        ]
+    ]
+    assert result.results["leader-running"] is True
+    assert result.results["worker-running"] is False
+
+
+def test_update_repo_rejects_invalid_branch(
+    harness: testing.Harness, tmp_path, monkeypatch: pytest.MonkeyPatch
+):
+    """Test _update_repo refuses branch names unsafe for shell interpolation."""
+    monkeypatch.setattr(charm, "REPO_DIR", tmp_path)
+    harness.update_config({"repo-branch": "main; rm -rf /"})
+    harness.begin()
+
+    with pytest.raises(ValueError, match="Invalid repo-branch"):
+        harness.charm._update_repo()
+
+
+def test_install_with_invalid_branch_sets_blocked_status(
+    harness: testing.Harness, tmp_path, monkeypatch: pytest.MonkeyPatch
+):
+    """Test an invalid repo-branch during install blocks instead of crashing the hook."""
+    monkeypatch.setattr(charm, "REPO_DIR", tmp_path)
+    (tmp_path / ".git").mkdir()
+    harness.update_config({"repo-branch": "main; rm -rf /"})
+    harness.begin()
+    harness.charm._install_system_packages = lambda: None
+
+    def fake_run(cmd, **kwargs):
+        # The existing clone tracks the configured remote, so install updates it
+        return subprocess.CompletedProcess(cmd, 0, stdout=harness.charm.config["repo-url"])
+
+    monkeypatch.setattr(charm.subprocess, "run", fake_run)
+
+    harness.charm.on.install.emit()
+    harness.evaluate_status()
+    assert harness.charm.unit.status.name == "blocked"
+    assert "Invalid repo-branch" in harness.charm.unit.status.message
+
+
+def test_fetch_metrics_action_archives_run_files(
+    harness: testing.Harness, valid_s3_config: dict, tmp_path, monkeypatch: pytest.MonkeyPatch
+):
+    """Test fetch-metrics action archives every file and subdirectory in the run directory."""
+    monkeypatch.setattr(charm, "DATA_DIR", tmp_path)
+    metrics_dir = tmp_path / "run-1"
+    metrics_dir.mkdir()
+    (metrics_dir / "metrics_stats.csv").write_text("Type,Name\\nS3,upload\\n")
+    (metrics_dir / "report.html").write_text("<html></html>")
+    (metrics_dir / "locust").mkdir()
+    (metrics_dir / "locust" / "stats.csv").write_text("a,b\n")
+
+    harness.set_leader(True)
+    harness.update_config(valid_s3_config)
+    rel_id = harness.add_relation("cluster", "chopsticks")
+    harness.begin()
+    harness.update_relation_data(rel_id, harness.charm.app.name, {"test_run_id": "run-1"})
+
+    result = harness.run_action("fetch-metrics")
+    archive = pathlib.Path(result.results["archive"])
+    try:
+        with tarfile.open(archive) as tar:
+            assert sorted(tar.getnames()) == [
+                "locust",
+                "locust/stats.csv",
+                "metrics_stats.csv",
+                "report.html",
+            ]
+    finally:
+        archive.unlink()
+    assert result.results["stats-preview"].startswith("Type,Name")
+
+
+def test_fetch_metrics_action_archives_empty_run_dir(
+    harness: testing.Harness, valid_s3_config: dict, tmp_path, monkeypatch: pytest.MonkeyPatch
+):
+    """Test fetch-metrics action succeeds before locust has written any files."""
+    monkeypatch.setattr(charm, "DATA_DIR", tmp_path)
+    (tmp_path / "run-1").mkdir()
+
+    harness.set_leader(True)
+    harness.update_config(valid_s3_config)
+    rel_id = harness.add_relation("cluster", "chopsticks")
+    harness.begin()
+    harness.update_relation_data(rel_id, harness.charm.app.name, {"test_run_id": "run-1"})
+
+    result = harness.run_action("fetch-metrics")
+    archive = pathlib.Path(result.results["archive"])
+    try:
+        with tarfile.open(archive) as tar:
+            assert tar.getnames() == []
+    finally:
+        archive.unlink()
+    assert result.results["files"] == ""
+
+
+def test_fetch_metrics_action_fails_when_archive_fails(
+    harness: testing.Harness, valid_s3_config: dict, tmp_path, monkeypatch: pytest.MonkeyPatch
+):
+    """Test fetch-metrics action reports a tar failure instead of crashing the hook."""
+    monkeypatch.setattr(charm, "DATA_DIR", tmp_path)
+    (tmp_path / "run-1").mkdir()
+
+    harness.set_leader(True)
+    harness.update_config(valid_s3_config)
+    rel_id = harness.add_relation("cluster", "chopsticks")
+    harness.begin()
+    harness.update_relation_data(rel_id, harness.charm.app.name, {"test_run_id": "run-1"})
+
+    def fail_archive(*args):
+        raise subprocess.CalledProcessError(2, ["tar"], stderr=b"tar: error")
+
+    harness.charm._create_archive = fail_archive
+    with pytest.raises(testing.ActionFailed, match="Failed to create metrics archive"):
+        harness.run_action("fetch-metrics")
+
+
+def test_create_archive_falls_back_to_tarfile(
+    harness: testing.Harness, tmp_path, monkeypatch: pytest.MonkeyPatch
+):
+    """Test _create_archive uses Python's tarfile when tar is not installed."""
+    monkeypatch.setattr(charm.shutil, "which", lambda name: None)
+    (tmp_path / "metrics.csv").write_text("a,b\n")
+    archive = tmp_path / "out.tar.gz"
+    harness.begin()
+
+    harness.charm._create_archive(archive, tmp_path, ["metrics.csv"])
+    with tarfile.open(archive) as tar:
+        assert tar.getnames() == ["metrics.csv"]
+
+
+def test_config_error_status_survives_status_collection(
+    harness: testing.Harness, valid_s3_config: dict, tmp_path, monkeypatch: pytest.MonkeyPatch
+):
+    """Test a config-changed failure is reported instead of the ready status."""
+    monkeypatch.setattr(charm, "REPO_DIR", tmp_path)
+    valid_s3_config["repo-branch"] = "-bad"
+    harness.update_config(valid_s3_config)
+    harness.begin()
+
+    harness.charm.on.config_changed.emit()
+    harness.evaluate_status()
+    assert harness.charm.unit.status.name == "blocked"
+    assert "Config error" in harness.charm.unit.status.message
+
+
+def test_is_config_valid_recomputed_on_config_changed(
+    harness: testing.Harness, valid_s3_config: dict
+):
+    """Test the memoized _is_config_valid is refreshed by config-changed."""
+    harness.begin()
+    assert harness.charm._is_config_valid() is False
+
+    harness.charm._update_repo = lambda: None
+    harness.charm._render_s3_config = lambda: None
+    harness.update_config(valid_s3_config)
+    assert harness.charm._is_config_valid() is True
+
+
+def test_services_running_uses_dbus_when_available(
+    harness: testing.Harness, monkeypatch: pytest.MonkeyPatch
+):
+    """Test service state is read over D-Bus without forking systemctl."""
+    states = {"chopsticks-leader.service": b"active", "chopsticks-worker.service": b"inactive"}
+
+    class FakeBus:
+        def open(self):
+            pass
+
+    class FakeUnit:
+        def __init__(self, name, bus=None, _autoload=False):
+            self.Unit = type("Props", (), {"ActiveState": states[name]})
+
+    def fail_run(*args, **kwargs):
+        raise AssertionError("systemctl should not be called")
+
+    monkeypatch.setattr(charm, "DBus", FakeBus)
+    monkeypatch.setattr(charm, "Unit", FakeUnit)
+    monkeypatch.setattr(subprocess, "run", fail_run)
+    harness.begin()
+
+    running = harness.charm._services_running(["chopsticks-leader", "chopsticks-worker"])
+    assert running == {"chopsticks-leader": True, "chopsticks-worker": False}
+
+
+def test_services_running_does_not_retry_failed_bus(
+    harness: testing.Harness, monkeypatch: pytest.MonkeyPatch
+):
+    """Test a failed D-Bus connection falls back to systemctl without reconnecting."""
+    opened = []
+
+    class FailingBus:
+        def open(self):
+            opened.append(True)
+            raise OSError("no system bus")
+
+    monkeypatch.setattr(charm, "DBus", FailingBus)
+    monkeypatch.setattr(
+        subprocess,
+        "run",
+        lambda cmd, **kwargs: subprocess.CompletedProcess(cmd, 0, stdout="active\n"),
+    )
+    harness.begin()
+
+    assert harness.charm._is_service_running("chopsticks-worker") is True
+    assert harness.charm._is_service_running("chopsticks-worker") is True
+    assert opened == [True]
+
+
+def test_render_s3_config_skips_unchanged_content(
+    harness: testing.Harness, valid_s3_config: dict, tmp_path, monkeypatch: pytest.MonkeyPatch
+):
+    """Test _render_s3_config writes a private file and leaves identical content alone."""
+    config_path = tmp_path / "s3_config.yaml"
+    monkeypatch.setattr(charm, "CONFIG_DIR", tmp_path)
+    monkeypatch.setattr(charm, "S3_CONFIG_PATH", config_path)
+    harness.update_config(valid_s3_config)
+    harness.begin()
+
+    harness.charm._render_s3_config()
+    assert config_path.stat().st_mode & 0o777 == 0o600
+    assert "test-bucket" in config_path.read_text()
+
+    inode = config_path.stat().st_ino
+    harness.charm._render_s3_config()
+    assert config_path.stat().st_ino == inode
+
+
+def test_cluster_changed_skips_unchanged_leader_address(
+    harness: testing.Harness, valid_s3_config: dict, tmp_path, monkeypatch: pytest.MonkeyPatch
+):
+    """Test the leader does not republish an address it already published."""
+    monkeypatch.setattr(charm, "CONFIG_DIR", tmp_path)
+    monkeypatch.setattr(charm, "RUNTIME_CONFIG_PATH", tmp_path / "runtime.yaml")
+    harness.set_leader(True)
+    harness.update_config(valid_s3_config)
+    rel_id = harness.add_relation("cluster", "chopsticks")
+    harness.begin()
+    harness.charm._publish_leader_address()
+
+    published = []
+    monkeypatch.setattr(harness.charm, "_publish_leader_address", lambda: published.append(True))
+    harness.add_relation_unit(rel_id, "chopsticks/1")
+    assert published == []
+
+
+def test_leader_address_published_when_relation_created_after_leadership(
+    harness: testing.Harness, valid_s3_config: dict, tmp_path, monkeypatch: pytest.MonkeyPatch
+):
+    """Test the leader address reaches the databag when the peer relation comes later."""
+    monkeypatch.setattr(charm, "CONFIG_DIR", tmp_path)
+    monkeypatch.setattr(charm, "RUNTIME_CONFIG_PATH", tmp_path / "runtime.yaml")
+    harness.add_network("10.0.0.5")
+    harness.set_leader(True)
+    harness.update_config(valid_s3_config)
+    harness.begin()
+    harness.charm._publish_leader_address()
+    assert harness.charm._stored.last_published_leader == ""
+
+    rel_id = harness.add_relation("cluster", "chopsticks")
+    harness.add_relation_unit(rel_id, "chopsticks/1")
+    databag = harness.get_relation_data(rel_id, harness.charm.app.name)
+    assert databag["leader_address"] == "10.0.0.5"
+    assert databag["leader_unit"] == harness.charm.unit.name
+
+
+def test_render_worker_service_queues_one_reload_on_change(
+    harness: testing.Harness, tmp_path, monkeypatch: pytest.MonkeyPatch
+):
+    """Test rendering queues a single daemon-reload, and only for changed content."""
+    monkeypatch.setattr(charm, "SYSTEMD_DIR", tmp_path)
+    calls = []
+
+    def fake_run(cmd, **kwargs):
+        calls.append(cmd)
+        return subprocess.CompletedProcess(cmd, 0)
+
+    monkeypatch.setattr(subprocess, "run", fake_run)
+    harness.begin()
+
+    harness.charm._render_worker_service()
+    harness.charm._render_worker_service()
+    assert calls == []
+    harness.charm._flush_daemon_reload()
+    harness.charm._flush_daemon_reload()
+    assert calls == [["systemctl", "daemon-reload"]]
+    assert (tmp_path / "chopsticks-worker.service").read_text() == charm.WORKER_UNIT_CONTENT
+
+
+def test_render_leader_service_memoizes_inputs(
+    harness: testing.Harness, tmp_path, monkeypatch: pytest.MonkeyPatch
+):
+    """Test re-rendering with the same inputs does not regenerate the unit."""
+    monkeypatch.setattr(charm, "SYSTEMD_DIR", tmp_path)
+    harness.begin()
+    renders = []
+    render = harness.charm._leader_service_content
+    monkeypatch.setattr(
+        harness.charm,
+        "_leader_service_content",
+        lambda **kwargs: renders.append(kwargs) or render(**kwargs),
+    )
+    params = {
+        "test_run_id": "run-1",
+        "scenario_file": "scenarios/s3_large_objects.py",
+        "users": 5,
+        "spawn_rate": 1.0,
+        "duration": "1m",
+    }
+
+    harness.charm._render_leader_service(**params)
+    harness.charm._render_leader_service(**params)
+    assert len(renders) == 1
+    harness.charm._render_leader_service(**{**params, "users": 10})
+    assert len(renders) == 2
+    assert "CHOPSTICKS_USERS=10" in (tmp_path / "chopsticks-leader.service").read_text()
+
+
+def test_peer_data_cached_until_next_event(
+    harness: testing.Harness, monkeypatch: pytest.MonkeyPatch
+):
+    """Test peer data reads are cached within a hook and refreshed by the next event."""
+    rel_id = harness.add_relation("cluster", "chopsticks")
+    harness.begin()
+    harness.update_relation_data(rel_id, "chopsticks", {"scenario_file": "a.py"})
+    assert harness.charm._get_peer_data("scenario_file") == "a.py"
+
+    def fail_lookup():
+        raise AssertionError("databag should not be read again")
+
+    with monkeypatch.context() as m:
+        m.setattr(harness.charm, "_peer_app_databag", fail_lookup)
+        assert harness.charm._get_peer_data("scenario_file") == "a.py"
+
+    harness.update_relation_data(rel_id, "chopsticks", {"scenario_file": "b.py"})
+    assert harness.charm._get_peer_data("scenario_file") == "b.py"
+
+
+def test_reset_hook_caches_forgets_address_and_rendered_units(
+    harness: testing.Harness, tmp_path, monkeypatch: pytest.MonkeyPatch
+):
+    """Test the private IP and rendered unit inputs are refreshed for each hook."""
+    monkeypatch.setattr(charm, "SYSTEMD_DIR", tmp_path)
+    harness.add_network("10.0.0.5")
+    harness.begin()
+    assert harness.charm._private_ip == "10.0.0.5"
+    harness.charm._render_worker_service()
+    assert harness.charm._rendered_units
+
+    harness.charm._reset_hook_caches()
+    assert "_private_ip" not in harness.charm.__dict__
+    assert harness.charm._rendered_units == {}
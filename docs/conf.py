@@ -66,7 +66,8 @@ linkcheck_ignore = [
 ]
 
 linkcheck_anchors_ignore_for_url = [r"https://github\.com/.*"]
-linkcheck_retries = 3
+# CI can lower this (e.g. LINKCHECK_RETRIES=1) to fail fast on dead links
+linkcheck_retries = int(os.environ.get("LINKCHECK_RETRIES", "3"))
 
 ########################
 # Configuration extras #
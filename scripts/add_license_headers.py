@@ -1,8 +1,11 @@
 #!/usr/bin/env python3
 """Add GPLv3 license headers to Python source files."""
 
+import os
 import pathlib
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, Union
 
 HEADER = '''# Copyright (C) 2024 Canonical Ltd.
 #
@@ -19,36 +22,58 @@ HEADER = '''# Copyright (C) 2024 Canonical Ltd.
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 '''
+# The header is always followed by one extra blank line
+HEADER_BYTES = HEADER.encode() + b"\n"
 
 
-def has_license_header(content: str) -> bool:
+# License headers sit at the top of a file, so only this prefix is searched
+HEADER_SCAN_BYTES = 4096
+
+
+def has_license_header(data: bytes) -> bool:
     """Check if file already has a license header."""
-    return "GNU General Public License" in content or "Copyright" in content
+    return (
+        data.find(b"Copyright", 0, HEADER_SCAN_BYTES) != -1
+        or data.find(b"GNU General Public License", 0, HEADER_SCAN_BYTES) != -1
+    )
+
+
+def iter_python_files(directory: str) -> Iterator[str]:
+    """Yield paths of all .py files below directory, without following symlinks."""
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    yield from iter_python_files(entry.path)
+                elif entry.name.endswith(".py") and entry.is_file(follow_symlinks=False):
+                    yield entry.path
+    except FileNotFoundError:
+        return
 
 
-def add_header_to_file(filepath: pathlib.Path) -> bool:
+def add_header_to_file(filepath: Union[str, pathlib.Path]) -> bool:
     """Add license header to a Python file if it doesn't have one.
     
     Returns True if header was added, False if skipped.
     """
-    content = filepath.read_text()
+    with open(filepath, "rb") as f:
+        content = f.read()
     
     if has_license_header(content):
         return False
     
     # Preserve shebang if present
-    lines = content.split('\n')
-    new_content = []
-    
-    if lines and lines[0].startswith('#!'):
-        new_content.append(lines[0])
-        new_content.append(HEADER)
-        new_content.extend(lines[1:])
+    if content.startswith(b"#!"):
+        nl = content.find(b"\n")
+        if nl == -1:
+            new_content = content + b"\n" + HEADER.encode()
+        else:
+            new_content = content[:nl + 1] + HEADER_BYTES + content[nl + 1:]
     else:
-        new_content.append(HEADER)
-        new_content.extend(lines)
+        new_content = HEADER_BYTES + content
     
-    filepath.write_text('\n'.join(new_content))
+    with open(filepath, "wb") as f:
+        f.write(new_content)
     return True
 
 
@@ -58,18 +83,24 @@ def main():
     
     # Find all Python files
     python_files = []
-    for pattern in ['src/**/*.py', 'tests/**/*.py']:
-        python_files.extend(project_root.glob(pattern))
+    for directory in ['src', 'tests']:
+        python_files.extend(iter_python_files(os.path.join(project_root, directory)))
     
     added_count = 0
     skipped_count = 0
     
-    for filepath in python_files:
-        if add_header_to_file(filepath):
-            print(f"✅ Added header to {filepath.relative_to(project_root)}")
+    # File I/O releases the GIL, so threads overlap the reads and writes;
+    # map() keeps the report in file order
+    max_workers = min(32, (os.cpu_count() or 1) * 4)
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        results = pool.map(add_header_to_file, python_files)
+
+    for filepath, added in zip(python_files, results):
+        if added:
+            print(f"✅ Added header to {os.path.relpath(filepath, project_root)}")
             added_count += 1
         else:
-            print(f"⏭️  Skipped {filepath.relative_to(project_root)} (already has header)")
+            print(f"⏭️  Skipped {os.path.relpath(filepath, project_root)} (already has header)")
             skipped_count += 1
     
     print(f"\n✨ Summary: {added_count} headers added, {skipped_count} skipped")
@@ -17,11 +17,33 @@
 
 import argparse
 import sys
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 
+COMMANDS = ("run", "metrics")
 
-def create_parser() -> argparse.ArgumentParser:
-    """Create argument parser with subcommands"""
+# Parsers already built in this process, keyed by their subcommands
+_PARSERS: Dict[Tuple[str, ...], argparse.ArgumentParser] = {}
+
+
+def create_parser(commands: Optional[Iterable[str]] = None) -> argparse.ArgumentParser:
+    """
+    Create argument parser with subcommands
+
+    Parsers are built once per process and reused, since parse_args does not
+    modify the parser.
+
+    Args:
+        commands: Subcommands to build (defaults to all of COMMANDS)
+    """
+    key = COMMANDS if commands is None else tuple(commands)
+    parser = _PARSERS.get(key)
+    if parser is None:
+        parser = _PARSERS[key] = _build_parser(key)
+    return parser
+
+
+def _build_parser(commands: Tuple[str, ...]) -> argparse.ArgumentParser:
+    """Build an argument parser with the given subcommands"""
     parser = argparse.ArgumentParser(
         description="Chopsticks - Ceph stress testing framework using Locust",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -29,7 +51,14 @@ def create_parser() -> argparse.ArgumentParser:
 
     subparsers = parser.add_subparsers(dest="command", help="Command to run")
 
-    # 'run' command (existing behavior)
+    for command in commands:
+        _SUBPARSER_BUILDERS[command](subparsers)
+
+    return parser
+
+
+def _add_run_parser(subparsers: argparse._SubParsersAction) -> None:
+    """Add the 'run' command (existing behavior)"""
     run_parser = subparsers.add_parser("run", help="Run load tests")
 
     run_parser.add_argument(
@@ -110,7 +139,9 @@ def create_parser() -> argparse.ArgumentParser:
         help="Max time in seconds to wait for workers to connect (leader only). Default: 0 (wait forever).",
     )
 
-    # 'metrics' command group
+
+def _add_metrics_parser(subparsers: argparse._SubParsersAction) -> None:
+    """Add the 'metrics' command group"""
     metrics_parser = subparsers.add_parser(
         "metrics", help="Manage persistent metrics server"
     )
@@ -141,7 +172,11 @@ def create_parser() -> argparse.ArgumentParser:
         "--config", required=True, help="Path to workload config file"
     )
 
-    return parser
+
+_SUBPARSER_BUILDERS = {
+    "run": _add_run_parser,
+    "metrics": _add_metrics_parser,
+}
 
 
 def main(argv: Optional[List[str]] = None) -> int:
@@ -154,20 +189,26 @@ def main(argv: Optional[List[str]] = None) -> int:
     Returns:
         Exit code
     """
-    parser = create_parser()
+    if argv is None:
+        argv = sys.argv[1:]
+
+    # Old-style usage (backward compatibility): no subcommand but
+    # --workload-config given, treat as 'run' and parse only once
+    if (
+        argv
+        and argv[0] not in COMMANDS
+        and any("--workload-config" in arg for arg in argv)
+    ):
+        argv = ["run", *argv]
+
+    # Only build the subcommand that was asked for; help gets the full parser
+    command = argv[:1]
+    parser = create_parser(command if command and command[0] in COMMANDS else None)
     args = parser.parse_args(argv)
 
-    # Handle no subcommand - check if this looks like old-style invocation
     if args.command is None:
-        # Try to detect old-style usage (backward compatibility)
-        # If argv contains --workload-config and -f, treat as 'run'
-        if argv and any("--workload-config" in arg for arg in argv):
-            # Re-parse as 'run' command
-            argv_with_run = ["run"] + (argv if argv else sys.argv[1:])
-            args = parser.parse_args(argv_with_run)
-        else:
-            parser.print_help()
-            return 1
+        parser.print_help()
+        return 1
 
     # Route to appropriate handler
     if args.command == "run":
@@ -15,9 +15,29 @@
 
 """CLI commands for persistent metrics server management"""
 
+import atexit
+import traceback
+
 from chopsticks.utils.config_loader import load_config
 from chopsticks.metrics.daemon import MetricsDaemon
 
+# Shared HTTP session so repeated health checks reuse the connection
+_HTTP_SESSION = None
+
+
+def _get_session():
+    """Return the shared requests session, creating it on first use
+
+    Raises ImportError if requests is not installed.
+    """
+    global _HTTP_SESSION
+    if _HTTP_SESSION is None:
+        import requests
+
+        _HTTP_SESSION = requests.Session()
+        atexit.register(_HTTP_SESSION.close)
+    return _HTTP_SESSION
+
 
 def cmd_metrics_start(args) -> int:
     """Start persistent metrics server
@@ -80,8 +100,6 @@ def cmd_metrics_start(args) -> int:
 
     except Exception as e:
         print(f"ERROR: Failed to start metrics server: {e}")
-        import traceback
-
         traceback.print_exc()
         return 1
 
@@ -115,11 +133,12 @@ def cmd_metrics_status(args) -> int:
 
         daemon = MetricsDaemon(metrics_config)
 
-        if not daemon.is_running():
+        # get_status() already checks the PID, so don't call is_running() first
+        status = daemon.get_status()
+        if not status["running"]:
             print("Status: Not running")
             return 0
 
-        status = daemon.get_status()
         print("Status: Running")
         print(f"  PID: {status['pid']}")
         print(f"  Endpoint: http://{status['host']}:{status['port']}/metrics")
@@ -128,9 +147,7 @@ def cmd_metrics_status(args) -> int:
 
         # Try to ping the endpoint
         try:
-            import requests
-
-            response = requests.get(
+            response = _get_session().get(
                 f"http://{status['host']}:{status['port']}/metrics", timeout=2
             )
             if response.status_code == 200:
@@ -16,32 +16,47 @@
 """CLI command for running load tests"""
 
 import os
+import re
+import secrets
 import subprocess
 import sys
+import traceback
+from datetime import datetime
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Optional, Tuple
 
 from chopsticks.utils import config_loader
 
+# Top-level class whose base list names a workload class, e.g.
+# "class MyScenario(S3Workload):" or "class X(workloads.s3.S3Workload, Mixin):"
+_WORKLOAD_BASE_RE = re.compile(
+    r"^class\s+\w+\s*\([^)]*?\b(?:\w+\.)*([A-Z][a-z0-9]+)Workload\s*[,)]",
+    re.MULTILINE,
+)
+
+# Parent of the run directories created when CHOPSTICKS_RUN_DIR is not preset
+_RUN_BASE_DIR = "/tmp/chopsticks"
+
+# Detected workload types keyed by (path, mtime_ns, size), oldest evicted first
+_WORKLOAD_TYPE_CACHE: Dict[Tuple[str, int, int], str] = {}
+_WORKLOAD_TYPE_CACHE_SIZE = 64
+
 
 def validate_config_paths(args) -> None:
     """Validate configuration file paths exist."""
-    workload_config_path = Path(args.workload_config)
-    if not workload_config_path.exists():
+    if not os.path.exists(args.workload_config):
         raise FileNotFoundError(
             f"Workload configuration file not found: {args.workload_config}"
         )
 
     if hasattr(args, "scenario_config") and args.scenario_config:
-        scenario_config_path = Path(args.scenario_config)
-        if not scenario_config_path.exists():
+        if not os.path.exists(args.scenario_config):
             raise FileNotFoundError(
                 f"Scenario configuration file not found: {args.scenario_config}"
             )
 
     if args.locustfile:
-        locustfile_path = Path(args.locustfile)
-        if not locustfile_path.exists():
+        if not os.path.exists(args.locustfile):
             raise FileNotFoundError(
                 f"Locust scenario file not found: {args.locustfile}"
             )
@@ -70,9 +85,6 @@ def validate_arguments(args) -> None:
 
 def build_locust_command(args) -> tuple[List[str], str]:
     """Build Locust command from parsed arguments."""
-    import uuid
-    from datetime import datetime
-
     cmd = ["locust", "-f", args.locustfile]
     run_dir = ""
 
@@ -105,8 +117,7 @@ def build_locust_command(args) -> tuple[List[str], str]:
 
         # Users and spawn rate only for leader or standalone (not workers)
         if not worker:
-            cmd.extend(["-u", str(args.users)])
-            cmd.extend(["-r", str(args.spawn_rate)])
+            cmd += ["-u", str(args.users), "-r", str(args.spawn_rate)]
 
         # Create run-specific directory with abbreviated run ID (leader or standalone)
         if not worker:
@@ -115,14 +126,19 @@ def build_locust_command(args) -> tuple[List[str], str]:
             if not run_dir:
                 # Create our own directory if not pre-configured
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                run_id = str(uuid.uuid4())[:8]
-                run_dir = f"/tmp/chopsticks/{timestamp}_{run_id}"
+                run_id = secrets.token_hex(4)
+                run_dir = os.path.join(_RUN_BASE_DIR, f"{timestamp}_{run_id}")
                 os.environ["CHOPSTICKS_RUN_DIR"] = run_dir
 
+            # A preset run dir may have missing parents, so create the full path
             os.makedirs(run_dir, exist_ok=True)
 
-            cmd.extend(["--html", f"{run_dir}/locust_report.html"])
-            cmd.extend(["--csv", f"{run_dir}/locust"])
+            cmd += [
+                "--html",
+                os.path.join(run_dir, "locust_report.html"),
+                "--csv",
+                os.path.join(run_dir, "locust"),
+            ]
 
     # Duration
     if args.duration:
@@ -131,30 +147,75 @@ def build_locust_command(args) -> tuple[List[str], str]:
     return cmd, run_dir
 
 
-def detect_workload_type_from_locustfile(locustfile_path: str) -> str:
-    """Detect workload type by inspecting the scenario file's base class."""
+def _workload_type_from_class_name(name: str) -> Optional[str]:
+    """Extract the workload type from a class name (e.g., S3Workload -> s3)."""
+    # Prefix before "Workload" must be an uppercase letter followed by
+    # lowercase letters or digits
+    i = name.find("Workload")
+    if i < 2:
+        return None
+    prefix = name[:i]
+    if not "A" <= prefix[0] <= "Z":
+        return None
+    if not all("a" <= c <= "z" or "0" <= c <= "9" for c in prefix[1:]):
+        return None
+    return prefix.lower()
+
+
+def _detect_workload_type_from_ast(source: str) -> Optional[str]:
+    """Find the workload type by parsing the source, or None if not found."""
+    # ast is only needed when the text scan misses, so import it here
     import ast
-    import re
 
+    tree = ast.parse(source)
+
+    # Scenario classes live at module scope, so only top-level statements are checked
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef):
+            for base in node.bases:
+                if isinstance(base, ast.Name):
+                    workload_type = _workload_type_from_class_name(base.id)
+                # Handle attribute access like workloads.s3.S3Workload
+                elif isinstance(base, ast.Attribute):
+                    workload_type = _workload_type_from_class_name(base.attr)
+                else:
+                    continue
+                if workload_type:
+                    return workload_type
+    return None
+
+
+def detect_workload_type_from_locustfile(locustfile_path: str) -> str:
+    """Detect workload type by inspecting the scenario file's base class."""
+    try:
+        st = os.stat(locustfile_path)
+    except OSError:
+        return "s3"
+
+    key = (locustfile_path, st.st_mtime_ns, st.st_size)
+    workload_type = _WORKLOAD_TYPE_CACHE.get(key)
+    if workload_type is None:
+        workload_type = _read_workload_type(locustfile_path)
+        if len(_WORKLOAD_TYPE_CACHE) >= _WORKLOAD_TYPE_CACHE_SIZE:
+            del _WORKLOAD_TYPE_CACHE[next(iter(_WORKLOAD_TYPE_CACHE))]
+        _WORKLOAD_TYPE_CACHE[key] = workload_type
+    return workload_type
+
+
+def _read_workload_type(locustfile_path: str) -> str:
+    """Read the scenario file and extract its workload type."""
     try:
         with open(locustfile_path, "r") as f:
-            tree = ast.parse(f.read())
-
-        # Find class definitions that inherit from a workload class
-        for node in ast.walk(tree):
-            if isinstance(node, ast.ClassDef):
-                for base in node.bases:
-                    # Check if base class name contains "Workload"
-                    if isinstance(base, ast.Name) and "Workload" in base.id:
-                        # Extract workload type from class name (e.g., S3Workload -> s3)
-                        match = re.match(r"([A-Z][a-z0-9]+)Workload", base.id)
-                        if match:
-                            return match.group(1).lower()
-                    # Handle attribute access like workloads.s3.S3Workload
-                    elif isinstance(base, ast.Attribute) and "Workload" in base.attr:
-                        match = re.match(r"([A-Z][a-z0-9]+)Workload", base.attr)
-                        if match:
-                            return match.group(1).lower()
+            source = f.read()
+
+        # Common case: a plain text scan finds the base class without parsing
+        match = _WORKLOAD_BASE_RE.search(source)
+        if match:
+            return match.group(1).lower()
+
+        workload_type = _detect_workload_type_from_ast(source)
+        if workload_type:
+            return workload_type
     except Exception:
         pass
 
@@ -162,12 +223,15 @@ def detect_workload_type_from_locustfile(locustfile_path: str) -> str:
     return "s3"
 
 
+def _absolute_path(path: str) -> str:
+    """Return path as an absolute path, resolving it only when it is relative."""
+    p = Path(path)
+    return str(p if p.is_absolute() else p.resolve())
+
+
 def set_environment_variables(args) -> None:
     """Set environment variables for config paths."""
-    workload_config_path = Path(args.workload_config).resolve()
-
-    # Set generic config path
-    os.environ["CHOPSTICKS_WORKLOAD_CONFIG"] = str(workload_config_path)
+    workload_config_path = _absolute_path(args.workload_config)
 
     # Detect workload type from scenario file's base class (if available)
     if args.locustfile:
@@ -176,15 +240,21 @@ def set_environment_variables(args) -> None:
         # Default to S3 if no locustfile specified
         workload_type = "S3"
 
-    # Set workload-specific config path (e.g., S3_CONFIG_PATH)
-    os.environ[f"{workload_type}_CONFIG_PATH"] = str(workload_config_path)
-
-    # Set scenario config path (empty string if not provided)
+    # Scenario config path (empty string if not provided)
     if hasattr(args, "scenario_config") and args.scenario_config:
-        scenario_config_path = Path(args.scenario_config).resolve()
-        os.environ["CHOPSTICKS_SCENARIO_CONFIG"] = str(scenario_config_path)
+        scenario_config_path = _absolute_path(args.scenario_config)
     else:
-        os.environ["CHOPSTICKS_SCENARIO_CONFIG"] = ""
+        scenario_config_path = ""
+
+    os.environ.update(
+        {
+            # Generic config path
+            "CHOPSTICKS_WORKLOAD_CONFIG": workload_config_path,
+            # Workload-specific config path (e.g., S3_CONFIG_PATH)
+            f"{workload_type}_CONFIG_PATH": workload_config_path,
+            "CHOPSTICKS_SCENARIO_CONFIG": scenario_config_path,
+        }
+    )
 
 
 def cmd_run(args) -> int:
@@ -210,10 +280,11 @@ def cmd_run(args) -> int:
 
         cmd, run_dir = build_locust_command(args)
 
-        if run_dir:
-            print(f"Run directory: {run_dir}")
-
-        print(f"Executing: {' '.join(cmd)}")
+        lines = [f"Run directory: {run_dir}"] if run_dir else []
+        lines.append(f"Executing: {' '.join(cmd)}")
+        sys.stdout.write("\n".join(lines) + "\n")
+        # Flush before handing the terminal to locust so output stays ordered
+        sys.stdout.flush()
 
         result = subprocess.run(cmd)
 
@@ -227,7 +298,5 @@ def cmd_run(args) -> int:
         return 1
     except Exception as e:
         print(f"ERROR: Unexpected error: {e}", file=sys.stderr)
-        import traceback
-
         traceback.print_exc()
         return 1
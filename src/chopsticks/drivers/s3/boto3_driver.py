@@ -0,0 +1,124 @@
+# Copyright (C) 2024 Canonical Ltd.
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License version 3, as
+# published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import functools
+from typing import Optional, Dict, Any
+
+import boto3
+from botocore.config import Config
+from botocore.exceptions import BotoCoreError, ClientError
+
+from .base import BaseS3Driver
+
+
+@functools.lru_cache(maxsize=None)
+def _shared_client(
+    endpoint: str,
+    access_key: str,
+    secret_key: str,
+    region: str,
+    timeout: float,
+    max_pool_connections: int,
+):
+    """Return the process-wide S3 client for one set of connection settings.
+
+    Clients are thread-safe, so every Locust user in a process shares one
+    client and its connection pool instead of opening its own.
+    """
+    return boto3.client(
+        "s3",
+        endpoint_url=endpoint,
+        aws_access_key_id=access_key,
+        aws_secret_access_key=secret_key,
+        region_name=region,
+        config=Config(
+            connect_timeout=timeout,
+            read_timeout=timeout,
+            max_pool_connections=max_pool_connections,
+            # Failures are reported to Locust rather than retried; the legacy
+            # max_attempts key counts retries, so cap the total instead
+            retries={"total_max_attempts": 1},
+            tcp_keepalive=True,
+        ),
+    )
+
+
+class Boto3Driver(BaseS3Driver):
+    """S3 driver using boto3 with a pooled, keep-alive HTTP client"""
+
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        driver_config = config.get("driver_config", {})
+
+        self._client = _shared_client(
+            self.endpoint,
+            self.access_key,
+            self.secret_key,
+            self.region,
+            driver_config.get("timeout", 30),
+            driver_config.get("max_pool_connections", 256),
+        )
+
+    def upload(
+        self, key: str, data: bytes, metadata: Optional[Dict[str, str]] = None
+    ) -> bool:
+        """Upload object using boto3"""
+        try:
+            self._client.put_object(
+                Bucket=self.bucket, Key=key, Body=data, Metadata=metadata or {}
+            )
+            return True
+        except (BotoCoreError, ClientError):
+            return False
+
+    def download(self, key: str) -> Optional[bytes]:
+        """Download object using boto3"""
+        try:
+            response = self._client.get_object(Bucket=self.bucket, Key=key)
+            return response["Body"].read()
+        except (BotoCoreError, ClientError):
+            return None
+
+    def delete(self, key: str) -> bool:
+        """Delete object using boto3"""
+        try:
+            self._client.delete_object(Bucket=self.bucket, Key=key)
+            return True
+        except (BotoCoreError, ClientError):
+            return False
+
+    def list_objects(self, prefix: Optional[str] = None, max_keys: int = 1000) -> list:
+        """List objects using boto3"""
+        try:
+            response = self._client.list_objects_v2(
+                Bucket=self.bucket, Prefix=prefix or "", MaxKeys=max_keys
+            )
+        except (BotoCoreError, ClientError):
+            return []
+
+        return [obj["Key"] for obj in response.get("Contents", [])]
+
+    def head_object(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get object metadata using boto3"""
+        try:
+            response = self._client.head_object(Bucket=self.bucket, Key=key)
+        except (BotoCoreError, ClientError):
+            return None
+
+        return {
+            "size": response["ContentLength"],
+            "last_modified": str(response["LastModified"]),
+            "key": key,
+        }
@@ -14,11 +14,15 @@
 
 
 import os
+import re
 import subprocess
-import tempfile
-from typing import Optional, Dict, Any
+from itertools import islice
+from typing import Optional, Dict, Any, Union
 from .base import BaseS3Driver
 
+# s5cmd reports some failures on stderr while still exiting 0
+_STDERR_ERROR_RE = re.compile(rb"ERROR|error")
+
 
 class S5cmdDriver(BaseS3Driver):
     """S3 driver using s5cmd CLI tool"""
@@ -26,18 +30,23 @@ class S5cmdDriver(BaseS3Driver):
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
         self.s5cmd_path = config.get("driver_config", {}).get("s5cmd_path", "s5cmd")
-        self._setup_credentials()
-
-    def _setup_credentials(self):
-        """Setup environment variables for s5cmd authentication"""
-        os.environ["S3_ENDPOINT_URL"] = self.endpoint
-        os.environ["AWS_ACCESS_KEY_ID"] = self.access_key
-        os.environ["AWS_SECRET_ACCESS_KEY"] = self.secret_key
-        os.environ["AWS_REGION"] = self.region
+        # Credentials are passed to each s5cmd process rather than set globally,
+        # so drivers with different credentials can coexist
+        self._subprocess_env = {
+            **os.environ,
+            "S3_ENDPOINT_URL": self.endpoint,
+            "AWS_ACCESS_KEY_ID": self.access_key,
+            "AWS_SECRET_ACCESS_KEY": self.secret_key,
+            "AWS_REGION": self.region,
+        }
 
     def _run_command(
-        self, args: list, input_data: Optional[bytes] = None, timeout: int = 10
-    ) -> tuple[bool, str, str]:
+        self,
+        args: list,
+        input_data: Optional[bytes] = None,
+        timeout: int = 10,
+        decode: bool = True,
+    ) -> tuple[bool, Union[str, bytes], str]:
         """
         Run s5cmd command
 
@@ -45,6 +54,7 @@ class S5cmdDriver(BaseS3Driver):
             args: Command arguments
             input_data: Optional input data for stdin
             timeout: Command timeout in seconds (default: 10)
+            decode: Decode stdout to str; pass False to get raw bytes
 
         Returns:
             Tuple of (success, stdout, stderr)
@@ -52,14 +62,23 @@ class S5cmdDriver(BaseS3Driver):
         cmd = [self.s5cmd_path] + args
         try:
             result = subprocess.run(
-                cmd, input=input_data, capture_output=True, timeout=timeout
+                cmd,
+                input=input_data,
+                # Without input, don't let s5cmd inherit our stdin
+                stdin=subprocess.DEVNULL if input_data is None else None,
+                capture_output=True,
+                timeout=timeout,
+                env=self._subprocess_env,
             )
             success = result.returncode == 0
-            stdout = result.stdout.decode() if result.stdout else ""
+            if decode:
+                stdout = result.stdout.decode() if result.stdout else ""
+            else:
+                stdout = result.stdout
             stderr = result.stderr.decode() if result.stderr else ""
 
-            # Check for errors in stderr even if return code is 0
-            if not success or "ERROR" in stderr or "error" in stderr:
+            # Check for errors in stderr even if return code is 0 (single scan)
+            if not success or _STDERR_ERROR_RE.search(result.stderr or b""):
                 return False, stdout, stderr if stderr else "Command failed"
 
             return success, stdout, stderr
@@ -72,39 +91,24 @@ class S5cmdDriver(BaseS3Driver):
         self, key: str, data: bytes, metadata: Optional[Dict[str, str]] = None
     ) -> bool:
         """Upload object using s5cmd"""
-        with tempfile.NamedTemporaryFile(delete=False) as tmp:
-            tmp.write(data)
-            tmp.flush()
-            tmp_path = tmp.name
-
-        try:
-            s3_uri = f"s3://{self.bucket}/{key}"
-            success, stdout, stderr = self._run_command(["cp", tmp_path, s3_uri])
-            return success
-        finally:
-            os.unlink(tmp_path)
+        # 'pipe' uploads stdin directly, avoiding a temporary file
+        s3_uri = f"s3://{self.bucket}/{key}"
+        success, _, _ = self._run_command(
+            ["pipe", s3_uri], input_data=data, decode=False
+        )
+        return success
 
     def download(self, key: str) -> Optional[bytes]:
         """Download object using s5cmd"""
-        with tempfile.NamedTemporaryFile(delete=False) as tmp:
-            tmp_path = tmp.name
-
-        try:
-            s3_uri = f"s3://{self.bucket}/{key}"
-            success, stdout, stderr = self._run_command(["cp", s3_uri, tmp_path])
-
-            if success:
-                with open(tmp_path, "rb") as f:
-                    return f.read()
-            return None
-        finally:
-            if os.path.exists(tmp_path):
-                os.unlink(tmp_path)
+        # 'cat' streams the object to stdout, avoiding a temporary file
+        s3_uri = f"s3://{self.bucket}/{key}"
+        success, stdout, stderr = self._run_command(["cat", s3_uri], decode=False)
+        return stdout if success else None
 
     def delete(self, key: str) -> bool:
         """Delete object using s5cmd"""
         s3_uri = f"s3://{self.bucket}/{key}"
-        success, stdout, stderr = self._run_command(["rm", s3_uri])
+        success, _, _ = self._run_command(["rm", s3_uri], decode=False)
         return success
 
     def list_objects(self, prefix: Optional[str] = None, max_keys: int = 1000) -> list:
@@ -118,17 +122,10 @@ class S5cmdDriver(BaseS3Driver):
         if not success:
             return []
 
-        keys = []
-        for line in stdout.strip().split("\n"):
-            if line:
-                parts = line.split()
-                if len(parts) >= 4:
-                    key = " ".join(parts[3:])
-                    keys.append(key)
-                    if len(keys) >= max_keys:
-                        break
-
-        return keys
+        # Lines are "<date> <time> <size> <key>"; maxsplit keeps the key intact
+        rows = (line.split(None, 3) for line in stdout.splitlines())
+        keys = (parts[3] for parts in rows if len(parts) == 4)
+        return list(islice(keys, max_keys))
 
     def head_object(self, key: str) -> Optional[Dict[str, Any]]:
         """Get object metadata using s5cmd"""
@@ -138,14 +135,13 @@ class S5cmdDriver(BaseS3Driver):
         if not success:
             return None
 
-        for line in stdout.strip().split("\n"):
-            if line:
-                parts = line.split()
-                if len(parts) >= 4:
-                    return {
-                        "size": int(parts[2]) if parts[2].isdigit() else 0,
-                        "last_modified": f"{parts[0]} {parts[1]}",
-                        "key": key,
-                    }
+        for line in stdout.splitlines():
+            parts = line.split(None, 3)
+            if len(parts) == 4:
+                return {
+                    "size": int(parts[2]) if parts[2].isdigit() else 0,
+                    "last_modified": f"{parts[0]} {parts[1]}",
+                    "key": key,
+                }
 
         return None
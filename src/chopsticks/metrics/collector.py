@@ -15,13 +15,16 @@
 
 """Metrics collection and aggregation"""
 
-import statistics
 import json
 import csv
+import math
+import time
+from dataclasses import dataclass, field
 from pathlib import Path
 from datetime import datetime
 from typing import List, Dict, Any, Optional
-from collections import defaultdict
+from collections import Counter, defaultdict
+from operator import attrgetter
 
 from .models import (
     OperationMetric,
@@ -31,9 +34,79 @@ from .models import (
     ErrorMetric,
     TestConfiguration,
     OperationType,
+    WorkloadType,
 )
 
 
+@dataclass
+class _WindowAccumulator:
+    """Running totals for one operation type in the current aggregation window"""
+
+    workload_type: WorkloadType
+    total: int = 0
+    size_min: int = 0
+    size_max: int = 0
+    size_sum: int = 0
+    # Successful operations only; kept for the order statistics
+    durations: List[float] = field(default_factory=list)
+    throughputs: List[float] = field(default_factory=list)
+
+    def add(self, metric: OperationMetric):
+        """Fold one operation into the running totals"""
+        size = metric.object_size_bytes
+        if self.total:
+            self.size_min = min(self.size_min, size)
+            self.size_max = max(self.size_max, size)
+        else:
+            self.size_min = self.size_max = size
+        self.total += 1
+        self.size_sum += size
+
+        if metric.success:
+            self.durations.append(metric.duration_ms)
+            self.throughputs.append(metric.throughput_mbps)
+
+
+# Columns of the operations CSV export, in order
+_CSV_FIELDS = (
+    "operation_id",
+    "timestamp_start",
+    "timestamp_end",
+    "operation_type",
+    "workload_type",
+    "object_key",
+    "object_size_bytes",
+    "duration_ms",
+    "throughput_mbps",
+    "success",
+    "error_code",
+    "retry_count",
+    "driver",
+    "user_id",
+)
+
+# Per-column readers that take values straight off each metric instead of
+# building to_dict(); timestamps and enums are rendered as to_dict() does
+_CSV_CONVERTERS = {
+    "timestamp_start": lambda m: m.timestamp_start.isoformat(),
+    "timestamp_end": lambda m: m.timestamp_end.isoformat(),
+    "operation_type": lambda m: m.operation_type.value,
+    "workload_type": lambda m: m.workload_type.value,
+}
+_CSV_GETTERS = tuple(
+    _CSV_CONVERTERS.get(name) or attrgetter(name) for name in _CSV_FIELDS
+)
+
+# json.dumps builds a new encoder per call when given options like default=str
+_JSON_ENCODER = json.JSONEncoder(default=str)
+
+
+def _dumps_indented(obj: Any, level: int) -> str:
+    """Encode obj as indented JSON nested ``level`` spaces deep"""
+    # Strings are escaped by json, so every newline here is structural
+    return json.dumps(obj, indent=2, default=str).replace("\n", "\n" + " " * level)
+
+
 class MetricsCollector:
     """Collect and aggregate performance metrics"""
 
@@ -51,18 +124,23 @@ class MetricsCollector:
         self.system_metrics: List[SystemResourceMetric] = []
         self.error_metrics: List[ErrorMetric] = []
 
-        self._window_start = datetime.utcnow()
-        self._current_window_metrics: list[OperationMetric] = []
+        # Monotonic clock: cheaper than datetime and immune to clock changes
+        self._window_start = time.monotonic()
+        self._window: Dict[OperationType, _WindowAccumulator] = {}
 
     def record_operation(self, metric: OperationMetric):
         """Record a single operation metric"""
         self.operation_metrics.append(metric)
-        self._current_window_metrics.append(metric)
+
+        acc = self._window.get(metric.operation_type)
+        if acc is None:
+            acc = self._window[metric.operation_type] = _WindowAccumulator(
+                metric.workload_type
+            )
+        acc.add(metric)
 
         # Check if we need to aggregate
-        if (
-            datetime.utcnow() - self._window_start
-        ).total_seconds() >= self.aggregation_window:
+        if time.monotonic() - self._window_start >= self.aggregation_window:
             self._aggregate_current_window()
 
     def record_system_metric(self, metric: SystemResourceMetric):
@@ -75,66 +153,53 @@ class MetricsCollector:
 
     def _aggregate_current_window(self) -> List[AggregatedMetrics]:
         """Aggregate metrics for current time window"""
-        if not self._current_window_metrics:
+        if not self._window:
             return []
 
-        # Group by operation type
-        by_operation = defaultdict(list)
-        for metric in self._current_window_metrics:
-            by_operation[metric.operation_type].append(metric)
-
         # Aggregate each operation type
         aggregated = []
-        for op_type, metrics in by_operation.items():
-            agg = self._compute_aggregation(metrics, op_type)
+        for op_type, acc in self._window.items():
+            agg = self._compute_aggregation(acc, op_type)
             if agg:
                 aggregated.append(agg)
 
         # Reset window
-        self._window_start = datetime.utcnow()
-        self._current_window_metrics = []
+        self._window_start = time.monotonic()
+        self._window = {}
 
         return aggregated
 
     def _compute_aggregation(
-        self, metrics: List[OperationMetric], operation_type: OperationType
+        self, acc: _WindowAccumulator, operation_type: OperationType
     ) -> Optional[AggregatedMetrics]:
-        """Compute aggregated metrics for a list of operations"""
-        if not metrics:
+        """Compute aggregated metrics from a window's running totals"""
+        successful = len(acc.durations)
+        if not successful:
             return None
 
-        successful_metrics = [m for m in metrics if m.success]
-
-        if not successful_metrics:
-            return None
-
-        durations = [m.duration_ms for m in successful_metrics]
-        throughputs = [m.throughput_mbps for m in successful_metrics]
-        sizes = [m.object_size_bytes for m in metrics]
-
         return AggregatedMetrics(
             test_run_id=self.test_run_id,
             timestamp=datetime.utcnow(),
             window_seconds=self.aggregation_window,
             operation_type=operation_type,
-            workload_type=metrics[0].workload_type,
+            workload_type=acc.workload_type,
             operations={
-                "total": len(metrics),
-                "successful": len(successful_metrics),
-                "failed": len(metrics) - len(successful_metrics),
-                "success_rate": (len(successful_metrics) / len(metrics)) * 100,
+                "total": acc.total,
+                "successful": successful,
+                "failed": acc.total - successful,
+                "success_rate": (successful / acc.total) * 100,
             },
-            duration_ms=self._compute_statistics(durations),
-            throughput_mbps=self._compute_statistics(throughputs),
+            duration_ms=self._compute_statistics(acc.durations),
+            throughput_mbps=self._compute_statistics(acc.throughputs),
             object_size_bytes={
-                "min": min(sizes),
-                "max": max(sizes),
-                "mean": statistics.mean(sizes),
-                "total": float(sum(sizes)),
+                "min": acc.size_min,
+                "max": acc.size_max,
+                "mean": acc.size_sum / acc.total,
+                "total": float(acc.size_sum),
             },
             request_rate={
-                "rps": len(metrics) / self.aggregation_window,
-                "rpm": (len(metrics) / self.aggregation_window) * 60,
+                "rps": acc.total / self.aggregation_window,
+                "rpm": (acc.total / self.aggregation_window) * 60,
             },
         )
 
@@ -143,21 +208,28 @@ class MetricsCollector:
         if not data:
             return StatisticalSummary(0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0)
 
+        # Sort once; min, max, median and all percentiles are read from it
         sorted_data = sorted(data)
+        median = self._percentile(sorted_data, 50)
+
+        # Two-pass sample variance; fsum keeps it accurate without Fractions
+        n = len(data)
+        mean = math.fsum(data) / n
+        variance = math.fsum((x - mean) ** 2 for x in data) / (n - 1) if n > 1 else 0
 
         return StatisticalSummary(
-            min=min(data),
-            max=max(data),
-            mean=statistics.mean(data),
-            median=statistics.median(data),
-            p50=self._percentile(sorted_data, 50),
+            min=sorted_data[0],
+            max=sorted_data[-1],
+            mean=mean,
+            median=median,
+            p50=median,
             p75=self._percentile(sorted_data, 75),
             p90=self._percentile(sorted_data, 90),
             p95=self._percentile(sorted_data, 95),
             p99=self._percentile(sorted_data, 99),
             p99_9=self._percentile(sorted_data, 99.9),
-            stddev=statistics.stdev(data) if len(data) > 1 else 0,
-            variance=statistics.variance(data) if len(data) > 1 else 0,
+            stddev=math.sqrt(variance),
+            variance=variance,
         )
 
     def _percentile(self, sorted_data: List[float], percentile: float) -> float:
@@ -181,16 +253,19 @@ class MetricsCollector:
             return {}
 
         total_operations = len(self.operation_metrics)
-        successful = sum(1 for m in self.operation_metrics if m.success)
-        failed = total_operations - successful
-
-        durations = [m.duration_ms for m in self.operation_metrics if m.success]
-        throughputs = [m.throughput_mbps for m in self.operation_metrics if m.success]
 
-        # Group by operation type
+        # Group by operation type and collect successful samples in one pass
+        durations = []
+        throughputs = []
         by_operation = defaultdict(list)
         for metric in self.operation_metrics:
             by_operation[metric.operation_type].append(metric)
+            if metric.success:
+                durations.append(metric.duration_ms)
+                throughputs.append(metric.throughput_mbps)
+
+        successful = len(durations)
+        failed = total_operations - successful
 
         operation_summaries = {}
         for op_type, metrics in by_operation.items():
@@ -198,17 +273,18 @@ class MetricsCollector:
             if successful_ops:
                 op_durations = [m.duration_ms for m in successful_ops]
                 op_throughputs = [m.throughput_mbps for m in successful_ops]
+                sorted_durations = sorted(op_durations)
 
                 operation_summaries[op_type.value] = {
                     "count": len(metrics),
                     "success_rate": (len(successful_ops) / len(metrics)) * 100,
                     "duration_ms": {
-                        "mean": statistics.mean(op_durations),
-                        "p95": self._percentile(sorted(op_durations), 95),
-                        "p99": self._percentile(sorted(op_durations), 99),
+                        "mean": math.fsum(op_durations) / len(op_durations),
+                        "p95": self._percentile(sorted_durations, 95),
+                        "p99": self._percentile(sorted_durations, 99),
                     },
                     "throughput_mbps": {
-                        "mean": statistics.mean(op_throughputs),
+                        "mean": math.fsum(op_throughputs) / len(op_throughputs),
                         "max": max(op_throughputs),
                     },
                 }
@@ -245,56 +321,55 @@ class MetricsCollector:
 
     def _group_errors_by_category(self) -> Dict[str, int]:
         """Group errors by category"""
-        categories: dict[str, int] = defaultdict(int)
-        for error in self.error_metrics:
-            categories[error.error_category.value] += 1
-        return dict(categories)
+        return dict(Counter(error.error_category.value for error in self.error_metrics))
 
     def export_json(self, output_path: Path):
-        """Export all metrics as JSON"""
-        data = {
-            "test_config": self.test_config.to_dict(),
-            "summary": self.get_summary(),
-            "operation_metrics": [m.to_dict() for m in self.operation_metrics],
-            "system_metrics": [m.to_dict() for m in self.system_metrics],
-            "error_metrics": [m.to_dict() for m in self.error_metrics],
+        """Export all metrics as JSON
+
+        Records are encoded one at a time rather than building the whole
+        document in memory; the output matches json.dump(..., indent=2).
+        """
+        lists = {
+            "operation_metrics": self.operation_metrics,
+            "system_metrics": self.system_metrics,
+            "error_metrics": self.error_metrics,
         }
 
         with open(output_path, "w") as f:
-            json.dump(data, f, indent=2, default=str)
+            f.write('{\n  "test_config": ')
+            f.write(_dumps_indented(self.test_config.to_dict(), 2))
+            f.write(',\n  "summary": ')
+            f.write(_dumps_indented(self.get_summary(), 2))
+
+            for name, records in lists.items():
+                f.write(f',\n  "{name}": ')
+                if not records:
+                    f.write("[]")
+                    continue
+                f.write("[\n    ")
+                for i, record in enumerate(records):
+                    if i:
+                        f.write(",\n    ")
+                    f.write(_dumps_indented(record.to_dict(), 4))
+                f.write("\n  ]")
+
+            f.write("\n}")
 
     def export_jsonl(self, output_path: Path):
         """Export operations as JSON Lines"""
+        encode = _JSON_ENCODER.encode
         with open(output_path, "w") as f:
-            for metric in self.operation_metrics:
-                f.write(json.dumps(metric.to_dict(), default=str) + "\n")
+            f.writelines(encode(m.to_dict()) + "\n" for m in self.operation_metrics)
 
     def export_csv(self, output_path: Path):
         """Export operations as CSV"""
         if not self.operation_metrics:
             return
 
-        fieldnames = [
-            "operation_id",
-            "timestamp_start",
-            "timestamp_end",
-            "operation_type",
-            "workload_type",
-            "object_key",
-            "object_size_bytes",
-            "duration_ms",
-            "throughput_mbps",
-            "success",
-            "error_code",
-            "retry_count",
-            "driver",
-            "user_id",
-        ]
-
         with open(output_path, "w", newline="") as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction="ignore")
-            writer.writeheader()
-
-            for metric in self.operation_metrics:
-                row = metric.to_dict()
-                writer.writerow(row)
+            writer = csv.writer(f)
+            writer.writerow(_CSV_FIELDS)
+            writer.writerows(
+                [getter(metric) for getter in _CSV_GETTERS]
+                for metric in self.operation_metrics
+            )
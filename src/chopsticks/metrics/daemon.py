@@ -19,9 +19,10 @@ import os
 import signal
 import json
 import subprocess
+import sys
 import time
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
 
 
 class MetricsDaemon:
@@ -44,14 +45,15 @@ class MetricsDaemon:
         self.host = config.get("http_host", "0.0.0.0")
         self.port = config.get("http_port", 8090)
 
+        # ((st_ino, st_mtime_ns), pid) of the last PID file parsed by is_running
+        self._cached_pid: Optional[Tuple[Tuple[int, int], int]] = None
+
     def start(self):
         """Start metrics server as background daemon"""
         if self.is_running():
             raise RuntimeError("Metrics server already running")
 
         # Start server process in background
-        import sys
-
         cmd = [
             sys.executable,
             "-m",
@@ -151,15 +153,24 @@ class MetricsDaemon:
 
     def is_running(self) -> bool:
         """Check if metrics server is currently running"""
-        if not self.pid_file.exists():
+        try:
+            st = self.pid_file.stat()
+        except OSError:
             return False
 
         try:
-            pid = int(self.pid_file.read_text())
+            # Only re-read the PID file when it has been replaced or rewritten
+            key = (st.st_ino, st.st_mtime_ns)
+            if self._cached_pid and self._cached_pid[0] == key:
+                pid = self._cached_pid[1]
+            else:
+                pid = int(self.pid_file.read_text())
+                self._cached_pid = (key, pid)
             os.kill(pid, 0)  # Signal 0 just checks if process exists
             return True
         except (OSError, ValueError):
             # Clean up stale PID file
+            self._cached_pid = None
             self.pid_file.unlink(missing_ok=True)
             return False
 
@@ -180,10 +191,47 @@ class MetricsDaemon:
         except (OSError, ValueError):
             return False
 
+    def _pids_using_port(self) -> List[int]:
+        """Find processes holding a TCP socket on our port
+
+        Reads /proc/net/tcp{,6} and matches socket inodes against /proc/*/fd,
+        so no external tool is needed. Processes we may not inspect are skipped.
+        """
+        port_suffix = f":{int(self.port):04X}"
+        sockets = set()
+        for table in ("/proc/net/tcp", "/proc/net/tcp6"):
+            try:
+                with open(table) as f:
+                    next(f, None)  # Header line
+                    for line in f:
+                        # Columns: sl local_address rem_address st ... uid timeout inode
+                        fields = line.split()
+                        if fields[1].endswith(port_suffix) and fields[9] != "0":
+                            sockets.add(f"socket:[{fields[9]}]")
+            except OSError:
+                continue
+
+        if not sockets:
+            return []
+
+        pids = []
+        for pid in filter(str.isdigit, os.listdir("/proc")):
+            fd_dir = f"/proc/{pid}/fd"
+            try:
+                fds = os.listdir(fd_dir)
+            except OSError:
+                continue
+            for fd in fds:
+                try:
+                    if os.readlink(f"{fd_dir}/{fd}") in sockets:
+                        pids.append(int(pid))
+                        break
+                except OSError:
+                    continue
+        return pids
+
     def cleanup_stale_files(self):
         """Clean up stale PID, state, and socket files"""
-        from pathlib import Path
-
         # Remove PID file if it exists and process is not running
         if self.pid_file.exists():
             try:
@@ -205,26 +253,13 @@ class MetricsDaemon:
 
         # If port is in use, check if it's by an orphaned chopsticks process
         # Only attempt cleanup if we can verify it's a chopsticks process
-        try:
-            result = subprocess.run(
-                ["lsof", "-ti", f":{self.port}"],
-                capture_output=True,
-                text=True,
-                timeout=5,
-            )
-            if result.returncode == 0 and result.stdout.strip():
-                pids = [int(p) for p in result.stdout.strip().split("\n")]
-                for pid in pids:
-                    # Only kill if it's confirmed to be a chopsticks process
-                    if self._is_chopsticks_process(pid):
-                        try:
-                            os.kill(pid, signal.SIGTERM)
-                            time.sleep(0.5)
-                        except ProcessLookupError:
-                            pass
-        except (subprocess.TimeoutExpired, FileNotFoundError, ValueError):
-            # lsof not available, timeout, or invalid PID - skip port cleanup
-            pass
+        for pid in self._pids_using_port():
+            if self._is_chopsticks_process(pid):
+                try:
+                    os.kill(pid, signal.SIGTERM)
+                    time.sleep(0.5)
+                except ProcessLookupError:
+                    pass
 
         # Remove state file
         self.state_file.unlink(missing_ok=True)
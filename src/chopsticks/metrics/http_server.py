@@ -15,10 +15,11 @@
 
 """HTTP server to expose Prometheus metrics"""
 
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import selectors
 import threading
-from typing import Optional
 import time
+from typing import Optional, Tuple
 
 from .prometheus_exporter import PrometheusExporter
 from .ipc import MetricsIPCServer
@@ -26,10 +27,21 @@ from .models import OperationMetric, OperationType, WorkloadType
 from datetime import datetime
 
 
+INDEX_HTML = b"""
+            <html>
+            <head><title>Chopsticks Metrics</title></head>
+            <body>
+            <h1>Chopsticks Metrics Exporter</h1>
+            <p><a href="/metrics">Metrics endpoint</a></p>
+            </body>
+            </html>
+            """
+
+
 class MetricsHandler(BaseHTTPRequestHandler):
     """HTTP handler for Prometheus metrics endpoint"""
 
-    exporter: Optional[PrometheusExporter] = None
+    metrics_server: Optional["MetricsHTTPServer"] = None
 
     def do_GET(self):
         """Handle GET requests"""
@@ -38,25 +50,15 @@ class MetricsHandler(BaseHTTPRequestHandler):
             self.send_header("Content-Type", "text/plain; version=0.0.4")
             self.end_headers()
 
-            if self.exporter:
-                metrics_text = self.exporter.export()
-                self.wfile.write(metrics_text.encode("utf-8"))
+            if self.metrics_server:
+                self.wfile.write(self.metrics_server.get_export_bytes())
             else:
                 self.wfile.write(b"# No metrics available\n")
         elif self.path == "/":
             self.send_response(200)
             self.send_header("Content-Type", "text/html")
             self.end_headers()
-            html = b"""
-            <html>
-            <head><title>Chopsticks Metrics</title></head>
-            <body>
-            <h1>Chopsticks Metrics Exporter</h1>
-            <p><a href="/metrics">Metrics endpoint</a></p>
-            </body>
-            </html>
-            """
-            self.wfile.write(html)
+            self.wfile.write(INDEX_HTML)
         else:
             self.send_response(404)
             self.end_headers()
@@ -69,6 +71,9 @@ class MetricsHandler(BaseHTTPRequestHandler):
 class MetricsHTTPServer:
     """HTTP server for Prometheus metrics (persistent mode with IPC)"""
 
+    # Scrapes within this many seconds of each other share one export
+    EXPORT_CACHE_SECONDS = 1.0
+
     def __init__(
         self,
         host: str = "0.0.0.0",
@@ -79,10 +84,12 @@ class MetricsHTTPServer:
         self.port = port
         self.socket_path = socket_path
         self.exporter = PrometheusExporter()
-        self.server: Optional[HTTPServer] = None
+        self.server: Optional[ThreadingHTTPServer] = None
         self.ipc_server: Optional[MetricsIPCServer] = None
         self._ipc_thread: Optional[threading.Thread] = None
         self._running = False
+        self._export_lock = threading.Lock()
+        self._last_export: Optional[Tuple[float, bytes]] = None
 
     def _on_metric_received(self, metric_data: dict):
         """Callback when a metric is received via IPC"""
@@ -102,15 +109,29 @@ class MetricsHTTPServer:
         except Exception as e:
             print(f"Error reconstructing metric: {e}", flush=True)
 
+    def get_export_bytes(self) -> bytes:
+        """Return the encoded /metrics body, re-exporting at most once per second"""
+        with self._export_lock:
+            now = time.monotonic()
+            if (
+                self._last_export is None
+                or now - self._last_export[0] >= self.EXPORT_CACHE_SECONDS
+            ):
+                self._last_export = (now, self.exporter.export().encode("utf-8"))
+            return self._last_export[1]
+
     def _ipc_loop(self):
         """Background thread for handling IPC connections"""
-        while self._running:
-            self.ipc_server.accept_connections()
-            time.sleep(0.01)
+        # Sleep in the kernel until a client connects instead of polling
+        with selectors.DefaultSelector() as selector:
+            selector.register(self.ipc_server, selectors.EVENT_READ)
+            while self._running:
+                if selector.select(timeout=0.5):
+                    self.ipc_server.accept_connections()
 
     def start(self):
         """Start the HTTP server and IPC server"""
-        MetricsHandler.exporter = self.exporter
+        MetricsHandler.metrics_server = self
 
         # Start IPC server
         self.ipc_server = MetricsIPCServer(self.socket_path, self._on_metric_received)
@@ -121,8 +142,8 @@ class MetricsHTTPServer:
         self._ipc_thread = threading.Thread(target=self._ipc_loop, daemon=True)
         self._ipc_thread.start()
 
-        # Start HTTP server (blocking)
-        self.server = HTTPServer((self.host, self.port), MetricsHandler)
+        # Start HTTP server (blocking); each scrape is served on its own thread
+        self.server = ThreadingHTTPServer((self.host, self.port), MetricsHandler)
         # Allow quick reuse of the port after shutdown
         self.server.allow_reuse_address = True
         print(
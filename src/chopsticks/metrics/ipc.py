@@ -94,6 +94,10 @@ class MetricsIPCServer:
 
         print(f"IPC server listening on {self.socket_path}", flush=True)
 
+    def fileno(self) -> int:
+        """Return the listening socket's file descriptor (for selectors)"""
+        return self._socket.fileno()
+
     def accept_connections(self):
         """Accept and handle client connections (non-blocking check)"""
         if not self._running or not self._socket:
@@ -110,20 +114,21 @@ class MetricsIPCServer:
 
     def _handle_client(self, conn: socket.socket):
         """Handle a client connection"""
-        buffer = ""
+        buffer = b""
         try:
             while True:
-                data = conn.recv(4096)
+                # Large reads pick up many queued metrics per syscall
+                data = conn.recv(65536)
                 if not data:
                     break
 
-                buffer += data.decode("utf-8")
-
-                # Process complete messages (newline-delimited)
-                while "\n" in buffer:
-                    line, buffer = buffer.split("\n", 1)
-                    if line.strip():
-                        self._process_metric(line.strip())
+                # Process complete messages (newline-delimited); the trailing
+                # partial line, possibly mid UTF-8 sequence, waits for more data
+                *lines, buffer = (buffer + data).split(b"\n")
+                for line in lines:
+                    line = line.strip()
+                    if line:
+                        self._process_metric(line)
         except socket.timeout:
             pass
         except Exception as e:
@@ -131,10 +136,11 @@ class MetricsIPCServer:
         finally:
             conn.close()
 
-    def _process_metric(self, json_str: str):
+    def _process_metric(self, message: bytes):
         """Process a received metric"""
         try:
-            data = json.loads(json_str)
+            # json.loads decodes UTF-8 bytes itself
+            data = json.loads(message)
             self.on_metric_received(data)
         except Exception as e:
             print(f"Error processing metric: {e}", flush=True)
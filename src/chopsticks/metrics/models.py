@@ -15,6 +15,7 @@
 
 """Data models for metrics collection"""
 
+import copy
 from dataclasses import dataclass, field, asdict
 from datetime import datetime
 from typing import Optional, Dict, Any
@@ -51,7 +52,7 @@ class ErrorCategory(str, Enum):
     UNKNOWN = "unknown"
 
 
-@dataclass
+@dataclass(slots=True)
 class OperationMetric:
     """Metric for a single I/O operation"""
 
@@ -74,12 +75,26 @@ class OperationMetric:
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary with string timestamps"""
-        data = asdict(self)
-        data["timestamp_start"] = self.timestamp_start.isoformat()
-        data["timestamp_end"] = self.timestamp_end.isoformat()
-        data["operation_type"] = self.operation_type.value
-        data["workload_type"] = self.workload_type.value
-        return data
+        # Built field by field: asdict() recurses into and deep-copies every value,
+        # which dominates export time for millions of flat records
+        return {
+            "operation_id": self.operation_id,
+            "timestamp_start": self.timestamp_start.isoformat(),
+            "timestamp_end": self.timestamp_end.isoformat(),
+            "operation_type": self.operation_type.value,
+            "workload_type": self.workload_type.value,
+            "object_key": self.object_key,
+            "object_size_bytes": self.object_size_bytes,
+            "duration_ms": self.duration_ms,
+            "throughput_mbps": self.throughput_mbps,
+            "success": self.success,
+            "error_code": self.error_code,
+            "error_message": self.error_message,
+            "retry_count": self.retry_count,
+            "driver": self.driver,
+            "user_id": self.user_id,
+            "metadata": copy.deepcopy(self.metadata) if self.metadata else {},
+        }
 
 
 @dataclass
@@ -16,6 +16,7 @@
 """Standalone metrics HTTP server that runs as a daemon"""
 
 import argparse
+import os
 import signal
 import sys
 from pathlib import Path
@@ -41,8 +42,6 @@ def main():
 
     # Write our own PID to file if specified
     if args.pid_file:
-        import os
-
         args.pid_file.write_text(str(os.getpid()))
 
     # Create and start server
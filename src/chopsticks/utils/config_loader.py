@@ -13,6 +13,8 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 
+import copy
+import functools
 import os
 import yaml
 from pathlib import Path
@@ -32,11 +34,19 @@ def load_config(config_path: str) -> Dict[str, Any]:
     Returns:
         Configuration dictionary
     """
-    path = Path(config_path)
-    if not path.exists():
+    try:
+        st = os.stat(config_path)
+    except OSError:
         raise FileNotFoundError(f"Configuration file not found: {config_path}")
 
-    with open(path, "r") as f:
+    # Hand out a copy so callers can't modify the cached parse
+    return copy.deepcopy(_parse_config(str(config_path), st.st_mtime_ns, st.st_size))
+
+
+@functools.lru_cache(maxsize=8)
+def _parse_config(config_path: str, mtime_ns: int, size: int) -> Any:
+    """Parse a YAML file; mtime and size key the cache so edits are picked up"""
+    with open(config_path, "r") as f:
         return yaml.safe_load(f)
 
 
@@ -15,6 +15,7 @@
 
 import os
 import time
+import uuid
 from locust import User, events
 from typing import Optional, Dict
 
@@ -194,6 +195,12 @@ class S3Workload(User, BaseMetricsWorkload):
 
     def _get_driver(self, driver_name: str) -> BaseS3Driver:
         """Get driver instance by name"""
+        if driver_name == "boto3":
+            # Imported here so runs with other drivers don't load boto3
+            from chopsticks.drivers.s3.boto3_driver import Boto3Driver
+
+            return Boto3Driver(self.config)
+
         drivers = {
             "s5cmd": S5cmdDriver,
             "dummy": DummyDriver,
@@ -207,8 +214,6 @@ class S3Workload(User, BaseMetricsWorkload):
 
     def generate_key(self, prefix: str = "test") -> str:
         """Generate unique object key"""
-        import uuid
-
         return f"{prefix}/{uuid.uuid4()}"
 
     def generate_data(self, size_bytes: int) -> bytes:
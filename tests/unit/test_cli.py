@@ -18,11 +18,12 @@
 import pytest
 from unittest.mock import patch
 
-from chopsticks.cli import create_parser
+from chopsticks.cli import create_parser, main
 from chopsticks.commands.run import (
     validate_config_paths,
     validate_arguments,
     build_locust_command,
+    detect_workload_type_from_locustfile,
     set_environment_variables,
 )
 
@@ -98,6 +99,39 @@ class TestParseArgs:
         with pytest.raises(SystemExit):
             parse_args([])
 
+    def test_parser_with_selected_commands(self):
+        """Test create_parser only builds the requested subcommands."""
+        parser = create_parser(["metrics"])
+        args = parser.parse_args(["metrics", "status", "--config", "s3.yaml"])
+        assert args.metrics_command == "status"
+
+        with pytest.raises(SystemExit):
+            parser.parse_args(["run", "--workload-config", "s3.yaml"])
+
+    def test_parser_is_reused(self):
+        """Test create_parser returns the same parser for the same subcommands."""
+        assert create_parser() is create_parser()
+        assert create_parser(["run"]) is create_parser(("run",))
+        assert create_parser(["run"]) is not create_parser()
+
+
+class TestMain:
+    """Test command dispatch in main()."""
+
+    def test_old_style_invocation_runs(self):
+        """Test arguments without a subcommand are dispatched to 'run'."""
+        with patch("chopsticks.commands.run.cmd_run", return_value=0) as cmd_run:
+            assert main(["--workload-config", "s3.yaml", "-f", "scenario.py"]) == 0
+
+        args = cmd_run.call_args.args[0]
+        assert args.command == "run"
+        assert args.workload_config == "s3.yaml"
+
+    def test_no_command_prints_help(self, capsys):
+        """Test a bare invocation prints help and fails."""
+        assert main([]) == 1
+        assert "usage:" in capsys.readouterr().out
+
 
 class TestValidateConfigPaths:
     """Test config path validation."""
@@ -405,6 +439,50 @@ class TestBuildLocustCommand:
         assert run_dir == ""
 
 
+class TestDetectWorkloadType:
+    """Test workload type detection from the scenario file."""
+
+    def test_qualified_base_among_several(self, tmp_path):
+        """Test a dotted workload base class that is not the first base."""
+        locustfile = tmp_path / "scenario.py"
+        locustfile.write_text(
+            "from chopsticks import workloads\n"
+            "class TestScenario(Mixin, workloads.rbd.RbdWorkload):\n"
+            "    pass\n"
+        )
+
+        assert detect_workload_type_from_locustfile(str(locustfile)) == "rbd"
+
+    def test_call_in_bases_uses_ast_fallback(self, tmp_path):
+        """Test a class the text scan cannot see is still found by parsing."""
+        locustfile = tmp_path / "scenario.py"
+        locustfile.write_text(
+            "class TestScenario(make_mixin(), RbdWorkload):\n    pass\n"
+        )
+
+        assert detect_workload_type_from_locustfile(str(locustfile)) == "rbd"
+
+    def test_defaults_to_s3(self, tmp_path):
+        """Test files without a workload base class default to s3."""
+        locustfile = tmp_path / "scenario.py"
+        locustfile.write_text("class TestScenario(BaseRbdWorkload):\n    pass\n")
+
+        assert detect_workload_type_from_locustfile(str(locustfile)) == "s3"
+
+    def test_cached_until_file_changes(self, tmp_path):
+        """Test detection is reused until the file's mtime or size changes."""
+        locustfile = tmp_path / "scenario.py"
+        locustfile.write_text("class TestScenario(RbdWorkload):\n    pass\n")
+        assert detect_workload_type_from_locustfile(str(locustfile)) == "rbd"
+
+        with patch("chopsticks.commands.run._read_workload_type") as mock_read:
+            assert detect_workload_type_from_locustfile(str(locustfile)) == "rbd"
+            mock_read.assert_not_called()
+
+        locustfile.write_text("class TestScenario(S3Workload):\n    pass\n")
+        assert detect_workload_type_from_locustfile(str(locustfile)) == "s3"
+
+
 class TestSetEnvironmentVariables:
     """Test environment variable setting."""
 
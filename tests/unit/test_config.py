@@ -53,3 +53,20 @@ class TestLoadConfig:
 
         with pytest.raises(FileNotFoundError, match="Configuration file not found"):
             load_config(str(non_existent))
+
+    def test_load_config_picks_up_changes(self, tmp_path):
+        """Validate cached configs are re-read when the file changes."""
+        config_file = tmp_path / "test_config.yaml"
+        config_file.write_text("bucket: first\n")
+        assert load_config(str(config_file))["bucket"] == "first"
+
+        config_file.write_text("bucket: second\n")
+        assert load_config(str(config_file))["bucket"] == "second"
+
+    def test_load_config_returns_independent_copies(self, tmp_path):
+        """Validate mutating a loaded config does not affect later loads."""
+        config_file = tmp_path / "test_config.yaml"
+        config_file.write_text("metrics:\n  enabled: true\n")
+
+        load_config(str(config_file))["metrics"]["enabled"] = False
+        assert load_config(str(config_file))["metrics"]["enabled"] is True
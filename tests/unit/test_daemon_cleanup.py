@@ -17,9 +17,10 @@
 
 import os
 import signal
+import socket
 import tempfile
 from pathlib import Path
-from unittest.mock import Mock, patch
+from unittest.mock import patch
 import pytest
 
 from chopsticks.metrics.daemon import MetricsDaemon
@@ -164,12 +165,8 @@ class TestDaemonCleanup:
 
         daemon = MetricsDaemon(config)
 
-        # Mock lsof finding a process on the port
-        mock_result = Mock()
-        mock_result.returncode = 0
-        mock_result.stdout = "12345"
-
-        with patch("subprocess.run", return_value=mock_result):
+        # Mock finding a process on the port
+        with patch.object(daemon, "_pids_using_port", return_value=[12345]):
             with patch.object(daemon, "_is_chopsticks_process", return_value=True):
                 with patch("os.kill") as mock_kill:
                     daemon.cleanup_stale_files()
@@ -191,12 +188,8 @@ class TestDaemonCleanup:
 
         daemon = MetricsDaemon(config)
 
-        # Mock lsof finding a process on the port
-        mock_result = Mock()
-        mock_result.returncode = 0
-        mock_result.stdout = "12345"
-
-        with patch("subprocess.run", return_value=mock_result):
+        # Mock finding a process on the port
+        with patch.object(daemon, "_pids_using_port", return_value=[12345]):
             with patch.object(daemon, "_is_chopsticks_process", return_value=False):
                 with patch("os.kill") as mock_kill:
                     daemon.cleanup_stale_files()
@@ -204,6 +197,18 @@ class TestDaemonCleanup:
                     # Should NOT have tried to kill the non-chopsticks process
                     mock_kill.assert_not_called()
 
+    def test_pids_using_port_finds_listening_process(self):
+        """Test that _pids_using_port finds a socket bound by this process"""
+        if not Path("/proc/net/tcp").exists():
+            pytest.skip("requires /proc/net/tcp")
+
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            sock.bind(("127.0.0.1", 0))
+            sock.listen()
+            daemon = MetricsDaemon({"http_port": sock.getsockname()[1]})
+
+            assert os.getpid() in daemon._pids_using_port()
+
     def test_stop_waits_for_process_to_exit(self, temp_files):
         """Test that stop() waits for process to exit gracefully"""
         config = {
@@ -231,3 +236,28 @@ class TestDaemonCleanup:
         # Files should be cleaned up
         assert not temp_files["pid_file"].exists()
         assert not temp_files["state_file"].exists()
+
+    def test_is_running_reuses_parsed_pid(self, temp_files):
+        """Test that is_running only re-reads the PID file after it changes"""
+        config = {
+            "persistent": {
+                "pid_file": str(temp_files["pid_file"]),
+                "state_file": str(temp_files["state_file"]),
+                "socket_path": temp_files["socket_path"],
+            },
+        }
+        temp_files["pid_file"].write_text(str(os.getpid()))
+
+        daemon = MetricsDaemon(config)
+        assert daemon.is_running()
+
+        with patch.object(Path, "read_text") as mock_read:
+            assert daemon.is_running()
+            mock_read.assert_not_called()
+
+        # A rewritten PID file is parsed again
+        temp_files["pid_file"].write_text("99999")
+        os.utime(temp_files["pid_file"], ns=(0, 0))
+        with patch("os.kill") as mock_kill:
+            assert daemon.is_running()
+        mock_kill.assert_called_once_with(99999, 0)
@@ -22,8 +22,10 @@ in various failure scenarios.
 
 import pytest
 from unittest.mock import Mock, patch
+from botocore.exceptions import ClientError, EndpointConnectionError
 from locust import events
 
+from chopsticks.drivers.s3.boto3_driver import Boto3Driver
 from chopsticks.drivers.s3.s5cmd_driver import S5cmdDriver
 from chopsticks.workloads.s3.s3_workload import S3Client
 
@@ -133,6 +135,71 @@ class TestS5cmdDriverErrorHandling:
             assert success is False
 
 
+class TestBoto3DriverErrorHandling:
+    """Test error handling in Boto3Driver"""
+
+    def setup_method(self):
+        """Setup test fixtures"""
+        self.driver = Boto3Driver(
+            {
+                "endpoint": "http://invalid-endpoint:8000",
+                "access_key": "invalid_access_key",
+                "secret_key": "invalid_secret_key",
+                "region": "default",
+                "bucket": "test-bucket",
+            }
+        )
+
+    def test_client_does_not_retry(self):
+        """Test that failed requests are reported once instead of retried"""
+        # Imported here: it loads ssl, which must happen after locust's gevent patch
+        from botocore.awsrequest import AWSResponse
+
+        assert self.driver._client.meta.config.retries["total_max_attempts"] == 1
+
+        # Answer every send with a retryable 500 and count the attempts
+        attempts = []
+
+        def server_error(request, **kwargs):
+            attempts.append(request)
+            return AWSResponse(request.url, 500, {}, Mock(stream=lambda: [b""]))
+
+        # The client is shared across drivers, so remove the handler afterwards
+        events = self.driver._client.meta.events
+        events.register("before-send.s3.PutObject", server_error)
+        try:
+            assert self.driver.upload("test-key", b"data") is False
+        finally:
+            events.unregister("before-send.s3.PutObject", server_error)
+        assert len(attempts) == 1
+
+    def test_client_shared_between_drivers(self):
+        """Test that drivers with the same settings share one client and pool"""
+        config = {
+            "endpoint": "http://invalid-endpoint:8000",
+            "access_key": "invalid_access_key",
+            "secret_key": "invalid_secret_key",
+            "region": "default",
+            "bucket": "other-bucket",
+        }
+        assert Boto3Driver(config)._client is self.driver._client
+
+        config["endpoint"] = "http://other-endpoint:8000"
+        assert Boto3Driver(config)._client is not self.driver._client
+
+    def test_upload_client_error(self):
+        """Test that upload fails on an S3 error response"""
+        error = ClientError({"Error": {"Code": "AccessDenied"}}, "PutObject")
+        with patch.object(self.driver._client, "put_object", side_effect=error):
+            assert self.driver.upload("test-key", b"data") is False
+
+    def test_download_connection_error(self):
+        """Test that download returns None when the endpoint is unreachable"""
+        error = EndpointConnectionError(endpoint_url="http://invalid-endpoint:8000")
+        with patch.object(self.driver._client, "get_object", side_effect=error):
+            assert self.driver.download("test-key") is None
+
+
 class TestS3ClientErrorReporting:
     """Test error reporting in S3Client to Locust"""
 
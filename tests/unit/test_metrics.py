@@ -15,7 +15,12 @@
 
 """Unit tests for metrics module."""
 
+import json
+import statistics
 from datetime import datetime, timedelta
+
+import pytest
+
 from chopsticks.metrics import (
     OperationMetric,
     OperationType,
@@ -176,6 +181,103 @@ class TestMetricsCollector:
         successful = sum(1 for m in collector.operation_metrics if m.success)
         assert successful == 3
 
+    def test_aggregate_current_window(self, sample_test_config):
+        """Test window aggregation from the running per-operation totals."""
+        collector = MetricsCollector(
+            test_run_id="test-123",
+            test_config=sample_test_config,
+            aggregation_window_seconds=3600,
+        )
+
+        start = datetime.utcnow()
+        for i, (size, success) in enumerate([(100, True), (300, False), (200, True)]):
+            collector.record_operation(
+                OperationMetric(
+                    operation_id=f"test-window-{i}",
+                    timestamp_start=start,
+                    timestamp_end=start + timedelta(seconds=1),
+                    operation_type=OperationType.UPLOAD,
+                    workload_type=WorkloadType.S3,
+                    object_key=f"key-{i}",
+                    object_size_bytes=size,
+                    duration_ms=10.0 * (i + 1),
+                    throughput_mbps=1.0,
+                    success=success,
+                    driver="s5cmd",
+                )
+            )
+
+        [agg] = collector._aggregate_current_window()
+
+        assert agg.operations["total"] == 3
+        assert agg.operations["successful"] == 2
+        assert agg.operations["failed"] == 1
+        assert agg.object_size_bytes == {
+            "min": 100,
+            "max": 300,
+            "mean": 200.0,
+            "total": 600.0,
+        }
+        assert agg.duration_ms.min == 10.0
+        assert agg.duration_ms.max == 30.0
+        assert collector._aggregate_current_window() == []
+
+    def test_export_json(self, sample_test_config, tmp_path):
+        """Test the streamed JSON export is a valid document."""
+        collector = MetricsCollector(
+            test_run_id="test-123",
+            test_config=sample_test_config,
+        )
+
+        start = datetime.utcnow()
+        for i in range(2):
+            collector.record_operation(
+                OperationMetric(
+                    operation_id=f"test-export-{i}",
+                    timestamp_start=start,
+                    timestamp_end=start + timedelta(seconds=1),
+                    operation_type=OperationType.DOWNLOAD,
+                    workload_type=WorkloadType.S3,
+                    object_key=f"key\n{i}",
+                    object_size_bytes=1024,
+                    duration_ms=5.0,
+                    throughput_mbps=0.2,
+                    success=True,
+                    driver="s5cmd",
+                )
+            )
+
+        output = tmp_path / "metrics.json"
+        collector.export_json(output)
+        data = json.loads(output.read_text())
+
+        assert data["test_config"]["test_run_id"] == sample_test_config.test_run_id
+        assert data["summary"]["operations"]["total"] == 2
+        assert [m["object_key"] for m in data["operation_metrics"]] == [
+            "key\n0",
+            "key\n1",
+        ]
+        assert data["system_metrics"] == []
+        assert data["error_metrics"] == []
+
+    def test_compute_statistics(self, sample_test_config):
+        """Test the statistical summary matches the statistics module."""
+        collector = MetricsCollector(
+            test_run_id="test-123",
+            test_config=sample_test_config,
+        )
+        data = [12.5, 3.0, 7.25, 99.0, 42.0, 3.0, 18.75, 55.5]
+
+        summary = collector._compute_statistics(data)
+
+        assert summary.min == 3.0
+        assert summary.max == 99.0
+        assert summary.median == summary.p50 == statistics.median(data)
+        assert summary.p95 == pytest.approx(83.775)
+        assert summary.mean == pytest.approx(statistics.mean(data))
+        assert summary.stddev == pytest.approx(statistics.stdev(data))
+        assert summary.variance == pytest.approx(statistics.variance(data))
+
 
 class TestTestConfiguration:
     """Tests for TestConfiguration model."""